@@ -6,6 +6,8 @@ FastAPI Application Factory
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.config.settings import settings
+
 
 def create_app(config_name='default'):
     """
@@ -27,7 +29,7 @@ def create_app(config_name='default'):
     # CORS Configuration
     app.add_middleware(
         CORSMiddleware,
-        allow_origins=["*"],
+        allow_origins=settings.cors_origins_list,
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
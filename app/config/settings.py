@@ -1,6 +1,6 @@
 import os
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 from pydantic_settings import BaseSettings
 
 # Cargar .env.local si existe (desarrollo), sino cargar .env
@@ -36,6 +36,23 @@ class Settings(BaseSettings):
     PORT: int = int(os.getenv('PORT', '8000'))
     ENV: str = os.getenv('ENV', 'production')
     
+    # ============ CORS ============
+    # Orígenes permitidos separados por coma. Sin "*": con allow_credentials=True
+    # el navegador rechaza el comodín y Starlette tendría que reflejar cada Origin.
+    CORS_ORIGINS: str = os.getenv(
+        'CORS_ORIGINS',
+        'https://falcontec.vercel.app,'   # Frontend producción Vercel
+        'http://localhost:5173,'          # Vite dev local
+        'http://localhost:3000,'          # React/Next.js local
+        'http://127.0.0.1:5173,'
+        'http://127.0.0.1:3000'
+    )
+    
+    @property
+    def cors_origins_list(self) -> List[str]:
+        """Lista de orígenes CORS (CORS_ORIGINS separado por comas)"""
+        return [origin.strip() for origin in self.CORS_ORIGINS.split(',') if origin.strip()]
+    
     # ============ REDIS (OPCIONAL) ============
     REDIS_URL: Optional[str] = os.getenv('REDIS_URL', None)
     
@@ -3,17 +3,18 @@ Rutas para generación de facturas PDF estilo Apple Store
 """
 from datetime import datetime
 from fastapi import APIRouter, HTTPException, Depends
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response
 from pydantic import BaseModel, Field
 from typing import List, Optional
-from io import BytesIO
 import asyncio
+import logging
 
 from app.services.invoice_pdf_service import InvoicePDFService
 from app.services.supabase_service import supabase_service
 from app.middleware import get_current_user_id
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 # Inicializar servicio
 invoice_service = InvoicePDFService()
@@ -116,15 +117,12 @@ def generar_factura_prueba(preview: bool = True):
         # Generar PDF estático
         pdf_bytes = invoice_service.generar_factura_estatica()
         
-        # Preparar respuesta como stream
-        pdf_stream = BytesIO(pdf_bytes)
-        
         # Nombre del archivo
         filename = f"factura_apple_test_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
         disposition = "inline" if preview else f"attachment; filename={filename}"
 
-        return StreamingResponse(
-            pdf_stream,
+        return Response(
+            content=pdf_bytes,
             media_type="application/pdf",
             headers={
                 "Content-Disposition": disposition
@@ -226,23 +224,27 @@ async def generar_factura_dinamica(
         # Paso 3.5: Persistir productos asociados a la factura
         # Guardar snapshot de los productos en el momento de la venta
         products_list = [p.model_dump() for p in request.products]
-        invoice_products_result = await supabase_service.invoices.create_invoice_products(
+        
+        # Paso 3.75: Resolver serial_number de cada producto desde product_items para el PDF
+        # Es independiente del insert anterior: ambas llamadas van en paralelo
+        item_ids = [p.product_item_id for p in request.products if p.product_item_id is not None]
+        invoice_products_result, serial_result = await asyncio.gather(
+            supabase_service.invoices.create_invoice_products(
                 invoice_id=invoice_id,
                 products_list=products_list
-            )
+            ),
+            supabase_service.invoices.get_product_items_by_ids(item_ids)
+        )
         
         if not invoice_products_result['success']:
             # Log warning pero no fallar la generación del PDF
             # Ya que la factura ya fue creada exitosamente
-            print(f"⚠️ Warning: Error al guardar productos de factura {invoice_id}: {invoice_products_result.get('error')}")
+            logger.warning(
+                "⚠️ Error al guardar productos de factura %s: %s",
+                invoice_id, invoice_products_result.get('error')
+            )
         
-        # Paso 3.75: Resolver serial_number de cada producto desde product_items para el PDF
-        item_ids = [p.product_item_id for p in request.products if p.product_item_id is not None]
-        serial_by_item_id: dict = {}
-        if item_ids:
-            serial_result = await supabase_service.invoices.get_product_items_by_ids(item_ids)
-            if serial_result['success']:
-                serial_by_item_id = serial_result['data']
+        serial_by_item_id: dict = serial_result['data'] if serial_result['success'] else {}
         
         # Enriquecer la lista de productos con serial_number resuelto desde BD
         products_for_pdf = []
@@ -271,14 +273,11 @@ async def generar_factura_dinamica(
             invoice_info=invoice_info_dict,
         )
         
-        # Preparar respuesta
-        pdf_stream = BytesIO(pdf_bytes)
-        
         # Nombre del archivo con número de orden
         filename = f"invoice_{request.order_number}_{datetime.now().strftime('%Y%m%d')}.pdf"
         
-        return StreamingResponse(
-            pdf_stream,
+        return Response(
+            content=pdf_bytes,
             media_type="application/pdf",
             headers={
                 "Content-Disposition": f"attachment; filename={filename}",
@@ -381,11 +380,10 @@ async def regenerar_factura_pdf(
             invoice_info=invoice_info_dict,
         )
 
-        pdf_stream = BytesIO(pdf_bytes)
         filename = f"invoice_{order_number}.pdf"
 
-        return StreamingResponse(
-            pdf_stream,
+        return Response(
+            content=pdf_bytes,
             media_type="application/pdf",
             headers={"Content-Disposition": f"inline; filename={filename}"}
         )
@@ -185,11 +185,10 @@ async def bulk_toggle_items_sold(request: BulkToggleRequest):
     for item_id in request.item_ids:
         try:
             # Obtener el status actual
-            client = await supabase_service.products._get_client()
-            assert client is not None
-            result = await client.table('product_items').select(
+            client = await supabase_service.products._require_client()
+            result = await supabase_service.products._execute(client.table('product_items').select(
                 'id, status, serial_number'
-            ).eq('id', item_id).execute()
+            ).eq('id', item_id), idempotent=True)
             
             if not result.data or not isinstance(result.data, list) or len(result.data) == 0:
                 results.append({
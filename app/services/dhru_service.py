@@ -1,4 +1,4 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import httpx
 import logging
 from app.config import settings
@@ -14,15 +14,37 @@ class DHRUService:
         self.base_url = settings.DHRU_API_BASE
         self.api_key = settings.DHRU_API_KEY
         self.timeout = 60
+        self._client: Optional[httpx.AsyncClient] = None
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """
+        Cliente HTTP compartido (lazy) con pool keep-alive.
+        Evita un handshake TCP/TLS por consulta; el timeout se pasa en cada request.
+        """
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=20,
+                    max_keepalive_connections=10,
+                    keepalive_expiry=30.0
+                )
+            )
+        return self._client
+    
+    async def aclose(self) -> None:
+        """Cierra el cliente HTTP compartido (llamar en el shutdown de la app)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
     
     async def get_balance(self) -> Dict[str, Any]:
         """Obtiene balance de la cuenta"""
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
-                response = await client.get(
-                    self.base_url,
-                    params={'action': 'balance', 'key': self.api_key}
-                )
+            response = await self._get_client().get(
+                self.base_url,
+                params={'action': 'balance', 'key': self.api_key},
+                timeout=10
+            )
             return {
                 'success': True,
                 'balance': float(response.text.strip())
@@ -33,16 +55,16 @@ class DHRUService:
     async def query_device(self, service_id: str, imei: str, format: str = 'beta') -> Dict[str, Any]:
         """Consulta información de dispositivo"""
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    self.base_url,
-                    params={
-                        'format': format,
-                        'key': self.api_key,
-                        'imei': imei,
-                        'service': service_id
-                    }
-                )
+            response = await self._get_client().get(
+                self.base_url,
+                params={
+                    'format': format,
+                    'key': self.api_key,
+                    'imei': imei,
+                    'service': service_id
+                },
+                timeout=self.timeout
+            )
             
             data = response.json()
             
@@ -72,11 +94,11 @@ class DHRUService:
         """Obtiene lista de servicios disponibles"""
         try:
             logger.info(f"Consultando servicios DHRU: {self.base_url}")
-            async with httpx.AsyncClient(timeout=10) as client:
-                response = await client.get(
-                    self.base_url,
-                    params={'action': 'services', 'key': self.api_key}
-                )
+            response = await self._get_client().get(
+                self.base_url,
+                params={'action': 'services', 'key': self.api_key},
+                timeout=10
+            )
             
             # Log del status code
             logger.info(f"Status code: {response.status_code}")
@@ -155,16 +177,16 @@ class DHRUService:
     async def search_history(self, imei_or_order: str, format: str = 'beta') -> Dict[str, Any]:
         """Busca en el historial de consultas"""
         try:
-            async with httpx.AsyncClient(timeout=30) as client:
-                response = await client.get(
-                    self.base_url,
-                    params={
-                        'format': format,
-                        'action': 'history',
-                        'key': self.api_key,
-                        'imei': imei_or_order
-                    }
-                )
+            response = await self._get_client().get(
+                self.base_url,
+                params={
+                    'format': format,
+                    'action': 'history',
+                    'key': self.api_key,
+                    'imei': imei_or_order
+                },
+                timeout=30
+            )
             if format == 'beta' or format == 'json':
                 return {
                     'success': True,
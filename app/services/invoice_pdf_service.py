@@ -1,25 +1,74 @@
 """
 Servicio para generación de PDFs de facturas estilo Apple Store
 """
+import hashlib
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, List, Optional
-from io import BytesIO
+from typing import Dict, Any, List, Optional, Tuple
 
+from cachetools import LRUCache
 from weasyprint import HTML, CSS
+from weasyprint.text.fonts import FontConfiguration
 from jinja2 import Environment, FileSystemLoader, select_autoescape
 
+# Directorio de templates y recursos (imágenes, fuentes, CSS), resuelto una sola vez
+_TEMPLATE_DIR = Path(__file__).parent.parent / "templates" / "invoices"
+_TEMPLATE_BASE_URL = str(_TEMPLATE_DIR)
+
+# PDFs ya generados, por contenido: (css_name, base_url, blake2b del HTML renderizado).
+# Re-descargar la misma factura (GET /{invoice_id}/pdf) produce el mismo HTML y evita el render.
+_pdf_cache: LRUCache = LRUCache(maxsize=32)
+_pdf_cache_lock = threading.Lock()
+
 
 class InvoicePDFService:
     """Servicio para generar facturas PDF estilo Apple Store"""
     
     def __init__(self): 
-        # Configurar Jinja2 para templates
-        template_dir = Path(__file__).parent.parent / "templates" / "invoices"
+        # Configurar Jinja2 para templates.
+        # auto_reload=False: los templates compilados quedan en cache y get_template
+        # no hace stat del archivo en cada factura (cambios requieren reiniciar, igual que el CSS)
         self.env = Environment(
-            loader=FileSystemLoader(str(template_dir)),
-            autoescape=select_autoescape(['html', 'xml'])
-        )    
+            loader=FileSystemLoader(_TEMPLATE_BASE_URL),
+            autoescape=select_autoescape(['html', 'xml']),
+            auto_reload=False
+        )
+        # Recursos de WeasyPrint por hilo (los PDFs se generan vía asyncio.to_thread)
+        self._thread_local = threading.local()
+    
+    def _get_render_resources(self, css_name: str) -> Tuple[FontConfiguration, List[CSS]]:
+        """
+        Obtiene la FontConfiguration y las hojas de estilo ya parseadas del hilo actual.
+        Sin font_config, WeasyPrint crea una FontConfiguration nueva en cada render
+        (inicializa fontconfig y vuelve a registrar las fuentes SF Pro), y el CSS de un
+        <style> se vuelve a tokenizar y compilar en cada factura. Aquí ambos se crean
+        una vez por hilo y se reutilizan; no se comparten entre hilos porque
+        Pango/fontconfig no son thread-safe.
+        
+        Args:
+            css_name: Archivo CSS del template (en el directorio de templates)
+            
+        Returns:
+            Tuple[FontConfiguration, List[CSS]]: Configuración de fuentes y hojas [fuentes, template]
+        """
+        local = self._thread_local
+        font_config = getattr(local, 'font_config', None)
+        if font_config is None:
+            font_config = FontConfiguration()
+            local.fonts_css = CSS(
+                filename=str(_TEMPLATE_DIR / "invoice_fonts.css"),
+                font_config=font_config
+            )
+            local.stylesheets = {}
+            local.font_config = font_config
+        
+        stylesheet = local.stylesheets.get(css_name)
+        if stylesheet is None:
+            stylesheet = CSS(filename=str(_TEMPLATE_DIR / css_name), font_config=font_config)
+            local.stylesheets[css_name] = stylesheet
+        return font_config, [local.fonts_css, stylesheet]
+    
     def generar_factura_estatica(self) -> bytes:
         """
         Genera PDF con datos estáticos para pruebas
@@ -33,11 +82,8 @@ class InvoicePDFService:
         # Renderizar HTML (sin datos dinámicos por ahora)
         html_content = template.render()
         
-        # Directorio base para recursos (imágenes, etc.)
-        template_dir = Path(__file__).parent.parent / "templates" / "invoices"
-        
         # Generar PDF
-        pdf_bytes = self._html_to_pdf(html_content, base_url=str(template_dir))
+        pdf_bytes = self._html_to_pdf(html_content, "apple_invoice.css", base_url=_TEMPLATE_BASE_URL)
         
         return pdf_bytes
     
@@ -81,34 +127,43 @@ class InvoicePDFService:
         # Renderizar HTML
         html_content = template.render(**contexto)
         
-        # Directorio base para recursos (imágenes, etc.)
-        template_dir = Path(__file__).parent.parent / "templates" / "invoices"
-        
         # Generar PDF
-        pdf_bytes = self._html_to_pdf(html_content, base_url=str(template_dir))
+        pdf_bytes = self._html_to_pdf(html_content, "apple_invoice_dynamic.css", base_url=_TEMPLATE_BASE_URL)
         
         return pdf_bytes
     
-    def _html_to_pdf(self, html_content: str, base_url: Optional[str] = None) -> bytes:
+    def _html_to_pdf(self, html_content: str, css_name: str, base_url: Optional[str] = None) -> bytes:
         """
         Convierte HTML a PDF usando WeasyPrint
         
         Args:
             html_content: String con HTML a convertir
+            css_name: Archivo CSS del template, aplicado como hoja ya parseada
             base_url: URL base para resolver rutas relativas de recursos (imágenes, CSS, etc.)
             
         Returns:
             bytes: PDF generado
         """
+        cache_key = (
+            css_name,
+            base_url,
+            hashlib.blake2b(html_content.encode('utf-8'), digest_size=16).digest()
+        )
+        with _pdf_cache_lock:
+            cached_pdf = _pdf_cache.get(cache_key)
+        if cached_pdf is not None:
+            return cached_pdf
+        
+        # Fuentes y estilos ya parseados para este hilo
+        font_config, stylesheets = self._get_render_resources(css_name)
+        
         # Crear objeto HTML de WeasyPrint
         html = HTML(string=html_content, base_url=base_url)
         
-        # Generar PDF en memoria
-        pdf_buffer = BytesIO()
-        html.write_pdf(pdf_buffer)
-        
-        # Obtener bytes del PDF
-        pdf_bytes = pdf_buffer.getvalue()
-        pdf_buffer.close()
+        # Sin target, write_pdf retorna directamente los bytes del PDF
+        # (evita el BytesIO propio y la copia extra de getvalue())
+        pdf_bytes = html.write_pdf(stylesheets=stylesheets, font_config=font_config)
         
+        with _pdf_cache_lock:
+            _pdf_cache[cache_key] = pdf_bytes
         return pdf_bytes
\ No newline at end of file
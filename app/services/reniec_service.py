@@ -4,7 +4,7 @@ Permite consultar información de personas por DNI
 Implementa cache local en BD para reducir llamadas externas
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import httpx
 import logging
 from app.config import settings
@@ -21,6 +21,29 @@ class ReniecService:
         self.base_url = settings.RENIEC_API_BASE
         self.api_token = settings.RENIEC_API_TOKEN
         self.timeout = 30
+        self._client: Optional[httpx.AsyncClient] = None
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """
+        Cliente HTTP compartido (lazy) con pool keep-alive.
+        Evita un handshake TCP/TLS por consulta de DNI.
+        """
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=10,
+                    max_keepalive_connections=5,
+                    keepalive_expiry=30.0
+                )
+            )
+        return self._client
+    
+    async def aclose(self) -> None:
+        """Cierra el cliente HTTP compartido (llamar en el shutdown de la app)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
     
     def _get_headers(self) -> Dict[str, str]:
         """Construye los headers necesarios para la API"""
@@ -69,64 +92,64 @@ class ReniecService:
             url = f"{self.base_url}/dni"
             
             # Realizar petición a API externa
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    url,
-                    params={'numero': numero},
-                    headers=self._get_headers()
+            client = self._get_client()
+            response = await client.get(
+                url,
+                params={'numero': numero},
+                headers=self._get_headers()
+            )
+            
+            # Verificar código de estado
+            if response.status_code == 200:
+                data = response.json()
+                
+                # Convertir nombres a formato título (Primera Letra Mayúscula)
+                if 'first_name' in data and data['first_name']:
+                    data['first_name'] = data['first_name'].title()
+                if 'first_last_name' in data and data['first_last_name']:
+                    data['first_last_name'] = data['first_last_name'].title()
+                if 'second_last_name' in data and data['second_last_name']:
+                    data['second_last_name'] = data['second_last_name'].title()
+                if 'full_name' in data and data['full_name']:
+                    data['full_name'] = data['full_name'].title()
+                
+                # 3. Guardar datos en BD para futuras consultas
+                logger.info(f"💾 Guardando datos de RENIEC en BD para DNI: {numero}")
+                save_result = await supabase_service.customers.update_customer_reniec_data(
+                    numero, data
                 )
                 
-                # Verificar código de estado
-                if response.status_code == 200:
-                    data = response.json()
-                    
-                    # Convertir nombres a formato título (Primera Letra Mayúscula)
-                    if 'first_name' in data and data['first_name']:
-                        data['first_name'] = data['first_name'].title()
-                    if 'first_last_name' in data and data['first_last_name']:
-                        data['first_last_name'] = data['first_last_name'].title()
-                    if 'second_last_name' in data and data['second_last_name']:
-                        data['second_last_name'] = data['second_last_name'].title()
-                    if 'full_name' in data and data['full_name']:
-                        data['full_name'] = data['full_name'].title()
-                    
-                    # 3. Guardar datos en BD para futuras consultas
-                    logger.info(f"💾 Guardando datos de RENIEC en BD para DNI: {numero}")
-                    save_result = await supabase_service.customers.update_customer_reniec_data(
-                        numero, data
-                    )
-                    
-                    if not save_result['success']:
-                        logger.warning(f"⚠️ No se pudo guardar datos de RENIEC en BD: {save_result.get('error')}")
-                    
-                    logger.info(f"✅ Consulta exitosa para DNI: {numero}")
-                    return {
-                        'success': True,
-                        'data': data,
-                        'source': 'api'  # Indicador de que vino de API externa
-                    }
-                elif response.status_code == 400:
-                    logger.warning(f"DNI inválido o no encontrado: {numero}")
-                    return {
-                        'success': False,
-                        'error': 'DNI inválido o no encontrado',
-                        'status_code': 400
-                    }
-                elif response.status_code == 401:
-                    logger.error("Token de autorización inválido")
-                    return {
-                        'success': False,
-                        'error': 'Token de autorización inválido',
-                        'status_code': 401
-                    }
-                else:
-                    logger.error(f"Error en API RENIEC: {response.status_code}")
-                    return {
-                        'success': False,
-                        'error': f'Error en la API: {response.status_code}',
-                        'status_code': response.status_code
-                    }
-                    
+                if not save_result['success']:
+                    logger.warning(f"⚠️ No se pudo guardar datos de RENIEC en BD: {save_result.get('error')}")
+                
+                logger.info(f"✅ Consulta exitosa para DNI: {numero}")
+                return {
+                    'success': True,
+                    'data': data,
+                    'source': 'api'  # Indicador de que vino de API externa
+                }
+            elif response.status_code == 400:
+                logger.warning(f"DNI inválido o no encontrado: {numero}")
+                return {
+                    'success': False,
+                    'error': 'DNI inválido o no encontrado',
+                    'status_code': 400
+                }
+            elif response.status_code == 401:
+                logger.error("Token de autorización inválido")
+                return {
+                    'success': False,
+                    'error': 'Token de autorización inválido',
+                    'status_code': 401
+                }
+            else:
+                logger.error(f"Error en API RENIEC: {response.status_code}")
+                return {
+                    'success': False,
+                    'error': f'Error en la API: {response.status_code}',
+                    'status_code': response.status_code
+                }
+                
         except httpx.TimeoutException:
             logger.error(f"Timeout al consultar DNI: {numero}")
             return {
@@ -5,11 +5,14 @@ Todos los repositorios heredan de esta clase para reutilizar la conexión
 
 import asyncio
 import logging
-from typing import Optional
+import random
+from typing import Any, Optional
+import httpx
 from app.config import settings
 
 try:
-    from supabase import acreate_client, AsyncClient
+    from supabase import acreate_client, AsyncClient, AsyncClientOptions
+    from postgrest.exceptions import APIError
 except ImportError:
     raise ImportError("Instala supabase-py: pip install supabase")
 
@@ -20,6 +23,39 @@ _supabase_client: Optional[AsyncClient] = None
 _client_initialized: bool = False
 _client_lock: asyncio.Lock | None = None
 
+# Reintentos ante backpressure de Supabase (rate limit / servicio no disponible)
+_RETRYABLE_CODES = {'429', '503'}
+_RETRY_TRIES = 4
+_RETRY_BASE_DELAY = 0.1
+_RETRY_MAX_DELAY = 2.0
+
+
+def _build_http_client() -> httpx.AsyncClient:
+    """
+    Crea el cliente HTTP compartido por el cliente Supabase.
+    Mantiene conexiones keep-alive en pool y usa HTTP/2 para multiplexar
+    peticiones concurrentes sobre una misma sesión TLS.
+    httpx envía Accept-Encoding (gzip, deflate y br con el extra brotli)
+    y descomprime de forma transparente, así que los JSON grandes
+    (ej: products con variantes e items) viajan comprimidos.
+    """
+    transport = httpx.AsyncHTTPTransport(
+        retries=2,
+        http2=True,
+        limits=httpx.Limits(
+            max_connections=50,
+            max_keepalive_connections=25,
+            keepalive_expiry=30.0
+        )
+    )
+    # Mismo timeout de lectura que el cliente PostgREST por defecto de supabase-py (120s):
+    # get_products_with_variants y las RPC pueden tardar más que una lectura simple.
+    # Solo la conexión falla rápido (3s).
+    return httpx.AsyncClient(
+        transport=transport,
+        timeout=httpx.Timeout(120.0, connect=3.0)
+    )
+
 
 def _get_lock() -> asyncio.Lock:
     """Obtiene o crea el lock para inicialización thread-safe del cliente"""
@@ -64,7 +100,8 @@ class BaseSupabaseRepository:
             try:
                 _supabase_client = await acreate_client(
                     settings.SUPABASE_URL,
-                    settings.SUPABASE_KEY
+                    settings.SUPABASE_KEY,
+                    options=AsyncClientOptions(httpx_client=_build_http_client())
                 )
                 _client_initialized = True
                 logger.info("✅ Conexión async con Supabase establecida (Singleton)")
@@ -75,6 +112,55 @@ class BaseSupabaseRepository:
                 _client_initialized = True
                 return None
     
+    @classmethod
+    async def _require_client(cls) -> AsyncClient:
+        """
+        Obtiene el cliente Singleton o lanza error si no hay conexión.
+        Para métodos que propagan excepciones en lugar de devolver {'success': False}.
+        
+        Returns:
+            AsyncClient de Supabase
+            
+        Raises:
+            ConnectionError: Si Supabase no está configurado o no se pudo conectar
+        """
+        client = await cls._get_client()
+        if client is None:
+            raise ConnectionError("Supabase no conectado")
+        return client
+    
+    @staticmethod
+    async def _execute(query: Any, idempotent: bool = False) -> Any:
+        """
+        Ejecuta una query de PostgREST con reintentos (backoff exponencial + jitter).
+        Todas las llamadas a Supabase de los repositorios pasan por aquí.
+        HTTP 429/503 se reintenta siempre: PostgREST rechazó la petición sin ejecutarla.
+        Una conexión cortada (RemoteProtocolError) solo se reintenta si idempotent=True,
+        porque una escritura pudo quedar confirmada antes del corte y repetirla
+        duplicaría filas. Los fallos al conectar ya los reintenta el transporte httpx.
+        
+        Args:
+            query: Builder de supabase-py (table(...).select(...), rpc(...), etc.)
+            idempotent: True para lecturas que se pueden repetir sin efectos
+            
+        Returns:
+            Respuesta de query.execute()
+        """
+        for attempt in range(_RETRY_TRIES):
+            try:
+                return await query.execute()
+            except (APIError, httpx.RemoteProtocolError) as e:
+                if isinstance(e, APIError) and str(e.code) not in _RETRYABLE_CODES:
+                    raise
+                if isinstance(e, httpx.RemoteProtocolError) and not idempotent:
+                    raise
+                if attempt == _RETRY_TRIES - 1:
+                    raise
+                
+                delay = min(_RETRY_BASE_DELAY * 2 ** attempt, _RETRY_MAX_DELAY) + random.uniform(0, 0.1)
+                logger.warning(f"⚠️  Supabase ocupado ({e}), reintento {attempt + 1} en {delay:.2f}s")
+                await asyncio.sleep(delay)
+    
     async def is_connected(self) -> bool:
         """
         Verifica si el cliente está conectado a Supabase
@@ -42,7 +42,7 @@ class CustomerRepository(BaseSupabaseRepository):
             if phone and phone.strip():
                 customer_data['phone'] = phone.strip()
             
-            response = await client.table('customers').insert(customer_data).execute()
+            response = await self._execute(client.table('customers').insert(customer_data))
             
             if not response.data:
                 return {'success': False, 'error': 'No se pudo crear el cliente'}
@@ -71,9 +71,9 @@ class CustomerRepository(BaseSupabaseRepository):
             return {'success': False, 'error': 'Cliente de Supabase no inicializado'}
         
         try:
-            response = await client.table('customers').select('*').eq(
+            response = await self._execute(client.table('customers').select('*').eq(
                 'dni', dni.strip()
-            ).execute()
+            ), idempotent=True)
             
             if not response.data:
                 return {'success': False, 'error': f'Cliente con DNI {dni} no encontrado'}
@@ -126,9 +126,9 @@ class CustomerRepository(BaseSupabaseRepository):
                 if needs_phone_update and phone and phone.strip():
                     # Actualizar el teléfono del cliente existente
                     logger.info(f"🔄 Actualizando teléfono para DNI: {dni}")
-                    update_result = await client.table('customers').update(
+                    update_result = await self._execute(client.table('customers').update(
                         {'phone': phone.strip()}
-                    ).eq('dni', dni.strip()).execute()
+                    ).eq('dni', dni.strip()))
                     
                     if update_result.data:
                         existing_customer = update_result.data[0]  # type: ignore
@@ -174,9 +174,9 @@ class CustomerRepository(BaseSupabaseRepository):
             return {'success': False, 'error': 'Cliente de Supabase no inicializado'}
         
         try:
-            response = await client.table('customers').select(
+            response = await self._execute(client.table('customers').select(
                 'dni, first_name, first_last_name, second_last_name, name, phone'
-            ).eq('dni', dni.strip()).execute()
+            ).eq('dni', dni.strip()), idempotent=True)
             
             if not response.data:
                 return {'success': False, 'error': 'Cliente no encontrado'}
@@ -251,7 +251,7 @@ class CustomerRepository(BaseSupabaseRepository):
             offset = (page - 1) * page_size
             query = query.range(offset, offset + page_size - 1)
 
-            response = await query.execute()
+            response = await self._execute(query, idempotent=True)
 
             customers: list = response.data or []
             total: int = response.count or 0
@@ -307,15 +307,12 @@ class CustomerRepository(BaseSupabaseRepository):
                 'second_last_name': reniec_data.get('second_last_name', '')
             }
             
-            # Intentar actualizar primero
-            response = await client.table('customers').update(
-                customer_update
-            ).eq('dni', dni.strip()).execute()
-            
-            # Si no hay datos, insertar (upsert)
-            if not response.data:
-                # No existe, crear nuevo sin phone (será NULL)
-                response = await client.table('customers').insert(customer_update).execute()
+            # Upsert por DNI (único) en una sola llamada.
+            # Solo se escriben las columnas enviadas: phone se conserva si ya existía
+            # y queda NULL en clientes nuevos.
+            response = await self._execute(client.table('customers').upsert(
+                customer_update, on_conflict='dni'
+            ))
             
             if not response.data:
                 return {'success': False, 'error': 'No se pudo actualizar/crear el cliente'}
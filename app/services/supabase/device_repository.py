@@ -4,7 +4,7 @@ Maneja las tablas: devices, consulta_history
 """
 
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from .base import BaseSupabaseRepository
 
 logger = logging.getLogger(__name__)
@@ -29,9 +29,9 @@ class DeviceRepository(BaseSupabaseRepository):
         if not client:
             return {'success': False, 'error': 'Supabase no conectado'}
         try:
-            response = await client.table('devices').insert(
-                device_data
-            ).execute()
+            response = await self._execute(
+                client.table('devices').insert(device_data)
+            )
             
             logger.info(f"✅ Dispositivo insertado: {device_data.get('imei')}")
             return {'success': True, 'data': response.data}
@@ -53,9 +53,10 @@ class DeviceRepository(BaseSupabaseRepository):
         if not client:
             return {'success': False, 'error': 'Supabase no conectado'}
         try:
-            response = await client.table('devices').select(
-                "*"
-            ).eq("imei", imei).execute()
+            response = await self._execute(
+                client.table('devices').select("*").eq("imei", imei),
+                idempotent=True
+            )
             
             if response.data:
                 return {'success': True, 'data': response.data[0]}
@@ -79,9 +80,9 @@ class DeviceRepository(BaseSupabaseRepository):
         if not client:
             return {'success': False, 'error': 'Supabase no conectado'}
         try:
-            response = await client.table('devices').update(
-                device_data
-            ).eq("imei", imei).execute()
+            response = await self._execute(
+                client.table('devices').update(device_data).eq("imei", imei)
+            )
             
             logger.info(f"✅ Dispositivo actualizado: {imei}")
             return {'success': True, 'data': response.data}
@@ -89,29 +90,33 @@ class DeviceRepository(BaseSupabaseRepository):
             logger.error(f"❌ Error al actualizar dispositivo: {str(e)}")
             return {'success': False, 'error': str(e)}
     
-    async def list_devices(self, limit: int = 100, offset: int = 0) -> Dict[str, Any]:
+    async def list_devices(self, limit: int = 100, cursor: Optional[int] = None) -> Dict[str, Any]:
         """
-        Lista dispositivos con paginación
+        Lista dispositivos con paginación por cursor (keyset sobre id).
+        A diferencia de OFFSET, el costo no crece con la profundidad de la página.
         
         Args:
             limit: Número máximo de resultados (default: 100)
-            offset: Offset para paginación (default: 0)
+            cursor: id del último dispositivo de la página anterior (None para la primera)
             
         Returns:
-            Dict con success, data (lista) o error
+            Dict con success, data (lista), next_cursor (None si no hay más) o error
         """
         client = await self._get_client()
         if not client:
-            return {'success': False, 'error': 'Supabase no conectado', 'data': []}
+            return {'success': False, 'error': 'Supabase no conectado', 'data': [], 'next_cursor': None}
         try:
-            response = await client.table('devices').select(
-                "*"
-            ).range(offset, offset + limit - 1).execute()
+            query = client.table('devices').select("*").order('id').limit(limit)
+            if cursor is not None:
+                query = query.gt('id', cursor)
+            response = await self._execute(query, idempotent=True)
             
-            return {'success': True, 'data': response.data}
+            data = response.data or []
+            next_cursor = data[-1]['id'] if len(data) == limit else None  # type: ignore
+            return {'success': True, 'data': data, 'next_cursor': next_cursor}
         except Exception as e:
             logger.error(f"❌ Error al listar dispositivos: {str(e)}")
-            return {'success': False, 'error': str(e), 'data': []}
+            return {'success': False, 'error': str(e), 'data': [], 'next_cursor': None}
     
     # ==================== TABLA: CONSULTA_HISTORY ====================
     
@@ -129,9 +134,9 @@ class DeviceRepository(BaseSupabaseRepository):
         if not client:
             return {'success': False, 'error': 'Supabase no conectado'}
         try:
-            response = await client.table('consulta_history').insert(
-                history_data
-            ).execute()
+            response = await self._execute(
+                client.table('consulta_history').insert(history_data)
+            )
             
             logger.info(f"✅ Consulta registrada: {history_data.get('imei')}")
             return {'success': True, 'data': response.data}
@@ -154,9 +159,11 @@ class DeviceRepository(BaseSupabaseRepository):
         if not client:
             return {'success': False, 'error': 'Supabase no conectado', 'data': []}
         try:
-            response = await client.table('consulta_history').select(
-                "*"
-            ).eq("imei", imei).order("created_at", desc=True).limit(limit).execute()
+            response = await self._execute(
+                client.table('consulta_history').select("*").eq("imei", imei)
+                .order("created_at", desc=True).limit(limit),
+                idempotent=True
+            )
             
             return {'success': True, 'data': response.data}
         except Exception as e:
@@ -84,7 +84,7 @@ class InvoiceRepository(BaseSupabaseRepository):
             if payment_holder is not None:
                 invoice_data['payment_holder'] = payment_holder.strip()
             
-            response = await client.table('invoices').insert(invoice_data).execute()
+            response = await self._execute(client.table('invoices').insert(invoice_data))
             
             if not response.data:
                 return {'success': False, 'error': 'No se pudo crear la factura'}
@@ -116,9 +116,9 @@ class InvoiceRepository(BaseSupabaseRepository):
             return {'success': False, 'error': 'Cliente de Supabase no inicializado'}
         
         try:
-            response = await client.table('invoices').select('*').eq(
+            response = await self._execute(client.table('invoices').select('*').eq(
                 'invoice_number', invoice_number.strip()
-            ).execute()
+            ), idempotent=True)
             
             if not response.data:
                 return {
@@ -147,9 +147,9 @@ class InvoiceRepository(BaseSupabaseRepository):
             return {'success': False, 'error': 'Cliente de Supabase no inicializado'}
         
         try:
-            response = await client.table('invoices').select('*').eq(
+            response = await self._execute(client.table('invoices').select('*').eq(
                 'customer_number', customer_number
-            ).order('created_at', desc=True).execute()
+            ).order('created_at', desc=True), idempotent=True)
             
             if not response.data:
                 return {
@@ -178,9 +178,9 @@ class InvoiceRepository(BaseSupabaseRepository):
             return {'success': False, 'error': 'Cliente de Supabase no inicializado'}
         
         try:
-            response = await client.table('invoices').select('*').eq(
+            response = await self._execute(client.table('invoices').select('*').eq(
                 'customer_id', customer_id
-            ).order('created_at', desc=True).execute()
+            ).order('created_at', desc=True), idempotent=True)
             
             if not response.data:
                 return {
@@ -209,9 +209,9 @@ class InvoiceRepository(BaseSupabaseRepository):
             return {'success': False, 'error': 'Cliente de Supabase no inicializado'}
         
         try:
-            response = await client.table('invoices').select('*').order(
+            response = await self._execute(client.table('invoices').select('*').order(
                 'created_at', desc=True
-            ).limit(limit).execute()
+            ).limit(limit), idempotent=True)
             
             return {'success': True, 'data': response.data or []}
             
@@ -241,7 +241,7 @@ class InvoiceRepository(BaseSupabaseRepository):
         try:
             offset = (page - 1) * page_size
 
-            response = await client.table('invoices').select(
+            response = await self._execute(client.table('invoices').select(
                 'id, invoice_date, shipping_agency, shipping_department, shipping_province, '
                 'bank_name, payment_total, payment_holder, '
                 'customers(name, dni, phone), '
@@ -252,7 +252,7 @@ class InvoiceRepository(BaseSupabaseRepository):
                 '  product_items(serial_number)'
                 ')',
                 count=CountMethod.exact
-            ).order('created_at', desc=True).range(offset, offset + page_size - 1).execute()
+            ).order('created_at', desc=True).range(offset, offset + page_size - 1), idempotent=True)
 
             total: int = response.count or 0
             total_pages = math.ceil(total / page_size) if total > 0 else 1
@@ -320,7 +320,7 @@ class InvoiceRepository(BaseSupabaseRepository):
                 invoice_products_data.append(product_data)
             
             # Insertar todos los productos en una sola operación
-            response = await client.table('invoice_products').insert(invoice_products_data).execute()
+            response = await self._execute(client.table('invoice_products').insert(invoice_products_data))
             
             if not response.data:
                 return {'success': False, 'error': 'No se pudieron crear los productos de la factura'}
@@ -351,7 +351,7 @@ class InvoiceRepository(BaseSupabaseRepository):
             return {'success': True, 'data': {}}
         
         try:
-            response = await client.table('product_items').select('id, serial_number').in_('id', item_ids).execute()
+            response = await self._execute(client.table('product_items').select('id, serial_number').in_('id', item_ids), idempotent=True)
             result = {
                 row['id']: row.get('serial_number')
                 for row in (response.data or [])
@@ -381,7 +381,7 @@ class InvoiceRepository(BaseSupabaseRepository):
         
         try:
             # Obtener la factura
-            invoice_response = await client.table('invoices').select('*').eq('id', invoice_id).execute()
+            invoice_response = await self._execute(client.table('invoices').select('*').eq('id', invoice_id), idempotent=True)
             
             if not invoice_response.data:
                 return {'success': False, 'error': f'Factura con ID {invoice_id} no encontrada'}
@@ -390,12 +390,12 @@ class InvoiceRepository(BaseSupabaseRepository):
             assert isinstance(invoice, dict)
             
             # Obtener los productos con JOINs a products, product_variants y product_items
-            products_response = await client.table('invoice_products').select(
+            products_response = await self._execute(client.table('invoice_products').select(
                 '*,' 
                 'products(id, name, category),' 
                 'product_variants(id, color, capacity, price),'
                 'product_items(id, serial_number, product_number)'
-            ).eq('invoice_id', invoice_id).order('id').execute()
+            ).eq('invoice_id', invoice_id).order('id'), idempotent=True)
             
             # Procesar datos para formato más legible
             products = []
@@ -434,9 +434,9 @@ class InvoiceRepository(BaseSupabaseRepository):
             # Obtener datos del cliente si la factura tiene customer_id
             customer: Dict[str, Any] = {}
             if invoice.get('customer_id'):
-                customer_response = await client.table('customers').select(
+                customer_response = await self._execute(client.table('customers').select(
                     'id, name, dni, phone'
-                ).eq('id', invoice['customer_id']).execute()
+                ).eq('id', invoice['customer_id']), idempotent=True)
                 if customer_response.data:
                     raw_customer = customer_response.data[0]  # type: ignore
                     assert isinstance(raw_customer, dict)
@@ -25,9 +25,8 @@ class OrderRepository(BaseSupabaseRepository):
         Inserta un pedido y sus productos en la BD.
         Returns the created order row.
         """
-        client = await self._get_client()
-        assert client is not None, "Supabase client not initialized"
-        order_resp = await (
+        client = await self._require_client()
+        order_resp = await self._execute(
             client.table("orders")
             .insert(
                 {
@@ -37,7 +36,6 @@ class OrderRepository(BaseSupabaseRepository):
                     "phase": "pedido",
                 }
             )
-            .execute()
         )
 
         if not order_resp.data:
@@ -56,7 +54,7 @@ class OrderRepository(BaseSupabaseRepository):
                 }
                 for p in products
             ]
-            await client.table("order_products").insert(rows).execute()
+            await self._execute(client.table("order_products").insert(rows))
 
         return data[0]
 
@@ -64,27 +62,24 @@ class OrderRepository(BaseSupabaseRepository):
         """
         Devuelve todos los pedidos con datos de cliente y productos.
         """
-        client = await self._get_client()
-        assert client is not None, "Supabase client not initialized"
-        resp = await (
+        client = await self._require_client()
+        resp = await self._execute(
             client.table("orders")
             .select("*, customers(name, dni, phone), order_products(*)")
-            .order("created_at", desc=True)
-            .execute()
+            .order("created_at", desc=True),
+            idempotent=True,
         )
         return resp.data or []
 
     async def update_order_phase(self, order_id: str, phase: str) -> dict:
-        client = await self._get_client()
-        assert client is not None, "Supabase client not initialized"
+        client = await self._require_client()
         if phase not in _VALID_PHASES:
             raise ValueError(f"Fase inválida: {phase}. Válidas: {_VALID_PHASES}")
 
-        resp = await (
+        resp = await self._execute(
             client.table("orders")
             .update({"phase": phase})
             .eq("id", order_id)
-            .execute()
         )
 
         if not resp.data:
@@ -93,6 +88,5 @@ class OrderRepository(BaseSupabaseRepository):
         return cast(list[dict[str, Any]], resp.data)[0]
 
     async def delete_order(self, order_id: str) -> None:
-        client = await self._get_client()
-        assert client is not None, "Supabase client not initialized"
-        await client.table("orders").delete().eq("id", order_id).execute()
+        client = await self._require_client()
+        await self._execute(client.table("orders").delete().eq("id", order_id))
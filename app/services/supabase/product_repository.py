@@ -88,19 +88,19 @@ class ProductRepository(BaseSupabaseRepository):
 
         try:
             # 1) Buscar o crear producto
-            product_response = await client.table('products').select('id').eq(
+            product_response = await self._execute(client.table('products').select('id').eq(
                 'name', normalized_name
-            ).eq('category', normalized_category).execute()
+            ).eq('category', normalized_category).limit(1), idempotent=True)
 
             if product_response.data and len(product_response.data) > 0:
                 product_data = product_response.data[0]
                 assert isinstance(product_data, dict)
                 product_id = product_data['id']
             else:
-                new_product = await client.table('products').insert({
+                new_product = await self._execute(client.table('products').insert({
                     'name': normalized_name,
                     'category': normalized_category,
-                }).execute()
+                }))
 
                 if not new_product.data or len(new_product.data) == 0:
                     return {'success': False, 'error': 'No se pudo crear el producto'}
@@ -131,7 +131,7 @@ class ProductRepository(BaseSupabaseRepository):
             else:
                 variant_query = variant_query.is_('chip', 'null')
 
-            variant_response = await variant_query.execute()
+            variant_response = await self._execute(variant_query.limit(1), idempotent=True)
 
             # Si no encontró coincidencia exacta y se proporcionó chip,
             # buscar si existe la variante sin chip (chip=NULL) para actualizarla
@@ -140,8 +140,8 @@ class ProductRepository(BaseSupabaseRepository):
             if (not variant_response.data or len(variant_response.data) == 0) and normalized_chip is not None:
                 fallback_query = _apply_color_capacity_filters(
                     client.table('product_variants').select('id, price').eq('product_id', product_id)
-                ).is_('chip', 'null')
-                fallback_response = await fallback_query.execute()
+                ).is_('chip', 'null').limit(1)
+                fallback_response = await self._execute(fallback_query, idempotent=True)
                 if fallback_response.data and len(fallback_response.data) > 0:
                     variant_response = fallback_response
                     upgrade_chip = True
@@ -159,15 +159,15 @@ class ProductRepository(BaseSupabaseRepository):
                 if current_price != detected_price:
                     update_fields['price'] = detected_price
                 if update_fields:
-                    await client.table('product_variants').update(update_fields).eq('id', variant_id).execute()
+                    await self._execute(client.table('product_variants').update(update_fields).eq('id', variant_id))
             else:
-                new_variant = await client.table('product_variants').insert({
+                new_variant = await self._execute(client.table('product_variants').insert({
                     'product_id': product_id,
                     'color': normalized_color,
                     'capacity': normalized_capacity,
                     'chip': normalized_chip,
                     'price': detected_price,
-                }).execute()
+                }))
 
                 if not new_variant.data or len(new_variant.data) == 0:
                     return {'success': False, 'error': 'No se pudo crear la variante'}
@@ -177,20 +177,20 @@ class ProductRepository(BaseSupabaseRepository):
                 variant_id = new_variant_data['id']
 
             # 3) Validar serial único
-            existing_item = await client.table('product_items').select('id').eq(
+            existing_item = await self._execute(client.table('product_items').select('id').eq(
                 'serial_number', normalized_serial
-            ).execute()
+            ).limit(1), idempotent=True)
 
             if existing_item.data and len(existing_item.data) > 0:
                 return {'success': False, 'error': 'El serial number ya existe'}
 
             # 4) Crear item
-            new_item = await client.table('product_items').insert({
+            new_item = await self._execute(client.table('product_items').insert({
                 'variant_id': variant_id,
                 'serial_number': normalized_serial,
                 'product_number': normalized_product_number,
                 'status': 'available',
-            }).execute()
+            }))
 
             if not new_item.data or len(new_item.data) == 0:
                 return {'success': False, 'error': 'No se pudo crear el item de inventario'}
@@ -223,17 +223,25 @@ class ProductRepository(BaseSupabaseRepository):
         client = await self._get_client()
         if not client:
             return {'success': False, 'error': 'Supabase no conectado', 'data': []}
+        
         try:
-            response = await client.table('products').select(
+            # quantity, serial_numbers y product_numbers se calculan en Postgres
+            # (vista product_variants_available, ver docs/PRODUCT_VARIANTS_AVAILABLE_VIEW.md).
+            # product_items se embebe completo (incluidos vendidos) para el toggle de status
+            # y las facturas, así que el payload no se reduce: solo el trabajo en Python.
+            response = await self._execute(client.table('products').select(
                 """
                 *,
-                product_variants (
+                product_variants:product_variants_available (
                     id,
                     color,
                     capacity,
                     chip,
                     price,
                     model_description,
+                    quantity,
+                    serial_numbers,
+                    product_numbers,
                     product_items (
                         id,
                         serial_number,
@@ -242,26 +250,9 @@ class ProductRepository(BaseSupabaseRepository):
                     )
                 )
                 """
-            ).eq('is_visible', True).execute()
+            ).eq('is_visible', True), idempotent=True)
 
             products = list(response.data) if response.data else []
-            for product in products:
-                if not isinstance(product, dict):
-                    continue
-                variants = product.get('product_variants') or []
-                if not isinstance(variants, list):
-                    continue
-                for variant in variants:
-                    if not isinstance(variant, dict):
-                        continue
-                    items = variant.get('product_items') or []
-                    if not isinstance(items, list):
-                        continue
-                    # Contar solo items disponibles
-                    available_items = [item for item in items if isinstance(item, dict) and item.get('status') == 'available']
-                    variant['quantity'] = len(available_items)
-                    variant['serial_numbers'] = [item.get('serial_number') for item in available_items if isinstance(item, dict) and item.get('serial_number')]
-                    variant['product_numbers'] = [item.get('product_number') for item in available_items if isinstance(item, dict) and item.get('product_number')]
             
             logger.info(f"Productos con variantes obtenidos: {len(products)} productos")
             return {'success': True, 'data': products, 'count': len(products)}
@@ -269,6 +260,81 @@ class ProductRepository(BaseSupabaseRepository):
             logger.error(f"Error al obtener productos con variantes: {str(e)}")
             return {'success': False, 'error': str(e), 'data': []}
     
+    @staticmethod
+    def _device_query_params(device_info: Dict[str, Any], metadata: Dict[str, Any], parsed_model: Dict[str, Optional[str]]) -> Dict[str, Any]:
+        """
+        Resuelve en Python los parámetros de la función SQL save_device_query:
+        nombre del producto, capacidad combinada (RAM/almacenamiento), chip,
+        Product Number (DHRU o estático), serial y precio.
+        
+        Returns:
+            Dict con las claves p_* de la RPC
+        """
+        # 1. NOMBRE DEL PRODUCTO
+        # Determinar qué usar como nombre del producto según el servicio DHRU usado
+        service_id = metadata.get('service_id', '30')
+        
+        raw_model = device_info.get('Model')
+        clean_device_model = clean_apple_watch_model(raw_model)
+
+        if service_id == "219":
+            # Servicio 219 (IMEI): 
+            # Prioridad: Model (limpio) > full_model parseado > Model_Description
+            product_name = clean_device_model or parsed_model.get('full_model') or device_info.get('Model_Description', 'Unknown')
+            logger.info(f"📱 Servicio 219 - Usando Model/full_model: {product_name}")
+        else:
+            # Servicio 30 (Serial): usar Model directo desde data (necesario para pricing)
+            product_name = clean_device_model or parsed_model.get('full_model') or device_info.get('Model_Description', 'Unknown')
+            logger.info(f"📱 Servicio 30 - Usando Model: {product_name}")
+
+        # 2. VARIANTE (color + capacidad)
+        color = parsed_model.get('color') or None
+        ram = parsed_model.get('ram') or None
+        capacity = parsed_model.get('capacity') or None
+        chip = parsed_model.get('chip') or None
+        
+        # Combinar RAM y capacidad en un solo string si ambos existen
+        if ram and capacity:
+            capacity_combined = f"{ram}/{capacity}"
+        elif capacity:
+            capacity_combined = capacity
+        else:
+            capacity_combined = None
+        
+        # 3. DETERMINAR PRODUCT NUMBER
+        # Si viene product_number en metadata (desde DHRU 219), usarlo
+        product_number = metadata.get('product_number')
+        
+        # Si no viene, intentar obtener el estático basado en el modelo parseado
+        if not product_number:
+            # Asegurar que product_name es un str antes de pasarlo a la función
+            safe_product_name = product_name if isinstance(product_name, str) else (str(product_name) if product_name is not None else "")
+            if not safe_product_name:
+                logger.info(f"ℹ️  Producto sin nombre válido para buscar Product Number: {product_name}")
+                product_number = None
+            else:
+                product_number = get_static_product_number(safe_product_name)
+                if product_number:
+                    logger.info(f"✅ Product Number estático asignado: {product_number}")
+                else:
+                    logger.info(f"ℹ️  Producto sin Product Number estático: {safe_product_name}")
+        
+        serial_number = device_info.get('Serial_Number') or device_info.get('IMEI', 'Unknown')
+        # Precio de la variante nueva: product_price > price (consulta DHRU)
+        product_price = metadata.get('product_price') or metadata.get('price', 0.0)
+        
+        return {
+            'p_name': product_name,
+            'p_category': parsed_model.get('brand') or None,
+            'p_color': color,
+            'p_capacity': capacity_combined,
+            'p_chip': chip,
+            'p_price': product_price,
+            'p_model_description': device_info.get('Model_Description'),
+            'p_serial': serial_number,
+            'p_product_number': product_number,
+        }
+    
     async def save_device_query(self, device_info: Dict[str, Any], metadata: Dict[str, Any], parsed_model: Dict[str, Optional[str]]) -> Dict[str, Any]:
         """
         Guarda un dispositivo consultado con toda su información relacionada.
@@ -295,165 +361,29 @@ class ProductRepository(BaseSupabaseRepository):
             return {'success': False, 'error': 'Supabase no conectado'}
         
         try:
-            # 1. BUSCAR O CREAR PRODUCTO
-            # Determinar qué usar como nombre del producto según el servicio DHRU usado
-            service_id = metadata.get('service_id', '30')
-            
-            raw_model = device_info.get('Model')
-            clean_device_model = clean_apple_watch_model(raw_model)
-
-            if service_id == "219":
-                # Servicio 219 (IMEI): 
-                # Prioridad: Model (limpio) > full_model parseado > Model_Description
-                product_name = clean_device_model or parsed_model.get('full_model') or device_info.get('Model_Description', 'Unknown')
-                logger.info(f"📱 Servicio 219 - Usando Model/full_model: {product_name}")
-            else:
-                # Servicio 30 (Serial): usar Model directo desde data (necesario para pricing)
-                product_name = clean_device_model or parsed_model.get('full_model') or device_info.get('Model_Description', 'Unknown')
-                logger.info(f"📱 Servicio 30 - Usando Model: {product_name}")
-
-            # Buscar si el producto ya existe
-            product_response = await client.table('products').select('*').eq('name', product_name).execute()
-            
-            if product_response.data and len(product_response.data) > 0:
-                product_data_item = product_response.data[0]
-                product_id = product_data_item['id']  # type: ignore
-                logger.info(f"✅ Producto existente encontrado: {product_name} (ID: {product_id})")
-            else:
-                # Crear nuevo producto
-                product_data = {
-                    'name': product_name,
-                    'category': parsed_model.get('brand') or None
-                }
-                new_product = await client.table('products').insert(product_data).execute()
-                if new_product.data and len(new_product.data) > 0:
-                    product_id = new_product.data[0]['id']  # type: ignore
-                else:
-                    raise ValueError('No se pudo crear el producto')
-                logger.info(f"✅ Nuevo producto creado: {product_name} (ID: {product_id})")
-            
-            # 2. BUSCAR O CREAR VARIANTE (color + capacidad)
-            color = parsed_model.get('color') or None
-            ram = parsed_model.get('ram') or None
-            capacity = parsed_model.get('capacity') or None
-            chip = parsed_model.get('chip') or None
+            params = self._device_query_params(device_info, metadata, parsed_model)
+            product_number = params['p_product_number']
             
-            # Combinar RAM y capacidad en un solo string si ambos existen
-            if ram and capacity:
-                capacity_combined = f"{ram}/{capacity}"
-            elif capacity:
-                capacity_combined = capacity
-            else:
-                capacity_combined = None
+            # UPSERT product -> variant -> item en una sola llamada (RPC)
+            # Ver docs/SAVE_DEVICE_QUERY_RPC.md para la definición de la función SQL
+            rpc_response = await self._execute(client.rpc('save_device_query', params))
             
-            # Construir query dinámicamente para manejar NULL
-            variant_query = client.table('product_variants').select('*').eq('product_id', product_id)
-            
-            if color is not None:
-                variant_query = variant_query.eq('color', color)
-            else:
-                variant_query = variant_query.is_('color', 'null')
+            if not rpc_response.data or len(rpc_response.data) == 0:
+                raise ValueError('No se pudo guardar el dispositivo')
             
-            if capacity_combined is not None:
-                variant_query = variant_query.eq('capacity', capacity_combined)
-            else:
-                variant_query = variant_query.is_('capacity', 'null')
-
-            if chip is not None:
-                variant_query = variant_query.eq('chip', chip)
-            else:
-                variant_query = variant_query.is_('chip', 'null')
-
-            variant_response = await variant_query.execute()
-            
-            if variant_response.data and len(variant_response.data) > 0:
-                variant_data_item = variant_response.data[0]
-                assert isinstance(variant_data_item, dict)
-                variant_id = variant_data_item['id']  # type: ignore
-                color_display = color if color else 'NULL'
-                capacity_display = capacity_combined if capacity_combined else 'NULL'
-                logger.info(f"✅ Variante existente: {color_display} {capacity_display} (ID: {variant_id})")
-                
-                # Actualizar model_description si es necesario
-                model_description = device_info.get('Model_Description')
-                if model_description and model_description != variant_data_item.get('model_description'):
-                    await client.table('product_variants').update({
-                        'model_description': model_description
-                    }).eq('id', variant_id).execute()
-                    logger.info(f"✅ Model description actualizado para variante {variant_id}")
-            else:
-                # Crear nueva variante con precio del producto o precio de consulta
-                # Prioridad: product_price > price (consulta DHRU)
-                product_price = metadata.get('product_price') or metadata.get('price', 0.0)
-                variant_data = {
-                    'product_id': product_id,
-                    'color': color,
-                    'capacity': capacity_combined,
-                    'chip': chip,
-                    'price': product_price,
-                    'model_description': device_info.get('Model_Description')
-                }
-                new_variant = await client.table('product_variants').insert(variant_data).execute()
-                if new_variant.data and len(new_variant.data) > 0:
-                    variant_id = new_variant.data[0]['id']  # type: ignore
-                else:
-                    raise ValueError('No se pudo crear la variante')
-                color_display = color if color else 'NULL'
-                capacity_display = capacity_combined if capacity_combined else 'NULL'
-                logger.info(f"✅ Nueva variante creada: {color_display} {capacity_display} (ID: {variant_id})")
+            saved = rpc_response.data[0]
+            assert isinstance(saved, dict)
+            product_id = saved['out_product_id']
+            variant_id = saved['out_variant_id']
+            item_id = saved['out_item_id']
             
-            # 3. DETERMINAR PRODUCT NUMBER
-            # Si viene product_number en metadata (desde DHRU 219), usarlo
-            product_number = metadata.get('product_number')
-            
-            # Si no viene, intentar obtener el estático basado en el modelo parseado
-            if not product_number:
-                # Asegurar que product_name es un str antes de pasarlo a la función
-                safe_product_name = product_name if isinstance(product_name, str) else (str(product_name) if product_name is not None else "")
-                if not safe_product_name:
-                    logger.info(f"ℹ️  Producto sin nombre válido para buscar Product Number: {product_name}")
-                    product_number = None
-                else:
-                    product_number = get_static_product_number(safe_product_name)
-                    if product_number:
-                        logger.info(f"✅ Product Number estático asignado: {product_number}")
-                    else:
-                        logger.info(f"ℹ️  Producto sin Product Number estático: {safe_product_name}")
-            
-            # 4. CREAR PRODUCT_ITEM (Serial Number único) con product_number
-            serial_number = device_info.get('Serial_Number') or device_info.get('IMEI', 'Unknown')
-            
-            # Verificar si ya existe este serial
-            existing_item = await client.table('product_items').select('*').eq(
-                'serial_number', serial_number
-            ).execute()
-            
-            if existing_item.data and len(existing_item.data) > 0:
-                logger.warning(f"⚠️  Serial number ya existe: {serial_number}")
-                item_data_existing = existing_item.data[0]
-                item_id = item_data_existing['id']  # type: ignore
-                
-                # Actualizar product_number si es necesario
-                update_data = {}
-                if product_number:
-                    update_data['product_number'] = product_number
-                
-                if update_data:
-                    await client.table('product_items').update(update_data).eq('id', item_id).execute()
-                    logger.info(f"✅ Datos actualizados para item {item_id}: {', '.join(update_data.keys())}")
-            else:
-                item_data = {
-                    'variant_id': variant_id,
-                    'serial_number': serial_number,
-                    'product_number': product_number,
-                    'status': 'available'  # Puedes ajustar según el iCloud_Lock u otro criterio
-                }
-                new_item = await client.table('product_items').insert(item_data).execute()
-                if new_item.data and len(new_item.data) > 0:
-                    item_id = new_item.data[0]['id']  # type: ignore
-                else:
-                    raise ValueError('No se pudo crear el product item')
-                logger.info(f"✅ Product item creado: {serial_number} | PN: {product_number or 'N/A'} (ID: {item_id})")
+            color_display = params['p_color'] or 'NULL'
+            capacity_display = params['p_capacity'] or 'NULL'
+            logger.info(
+                f"✅ Dispositivo guardado: {params['p_name']} {color_display} {capacity_display} | "
+                f"SN: {params['p_serial']} | PN: {product_number or 'N/A'} "
+                f"(product: {product_id}, variant: {variant_id}, item: {item_id})"
+            )
             
             return {
                 'success': True,
@@ -492,9 +422,9 @@ class ProductRepository(BaseSupabaseRepository):
                     'error': f'Status inválido. Debe ser uno de: {valid_statuses}'
                 }
             
-            response = await client.table('product_items').update({
-                'status': new_status
-            }).eq('id', item_id).execute()
+            response = await self._execute(
+                client.table('product_items').update({'status': new_status}).eq('id', item_id)
+            )
             
             if not response.data:
                 return {'success': False, 'error': 'Product item no encontrado'}
@@ -566,7 +496,7 @@ class ProductRepository(BaseSupabaseRepository):
             # Ordenar por nombre
             query = query.order('name', desc=False)
             
-            response = await query.execute()
+            response = await self._execute(query, idempotent=True)
             
             if not response.data:
                 return {
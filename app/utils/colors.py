@@ -3,7 +3,9 @@ Mapeo de nombres de colores Apple a códigos hexadecimales
 Para visualización de badges de color en el frontend
 """
 
-from typing import Dict, Optional
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional
 
 
 # Mapeo de colores Apple con sus códigos hexadecimales correspondientes
@@ -58,7 +60,19 @@ COLOR_HEX_MAP: Dict[str, str] = {
     'JET BLACK': '#0A0A0A',
 }
 
+# Vista de solo lectura para exponer el mapeo sin copiarlo
+_COLOR_HEX_MAP_VIEW: Mapping[str, str] = MappingProxyType(COLOR_HEX_MAP)
 
+# Color por defecto cuando no hay coincidencia
+DEFAULT_COLOR_HEX = '#808080'
+
+# Claves normalizadas (strip + upper) para búsqueda directa sin reprocesar el input
+_COLOR_HEX_MAP_NORM: Dict[str, str] = {
+    key.strip().upper(): value for key, value in COLOR_HEX_MAP.items()
+}
+
+
+@lru_cache(maxsize=256)
 def get_color_hex(color_name: Optional[str]) -> str:
     """
     Obtiene el código hexadecimal para un nombre de color.
@@ -80,10 +94,14 @@ def get_color_hex(color_name: Optional[str]) -> str:
         '#808080'
     """
     if not color_name:
-        return '#808080'  # Gris por defecto
+        return DEFAULT_COLOR_HEX  # Gris por defecto
+    
+    # La mayoría de colores ya llegan normalizados desde la BD
+    hex_code = _COLOR_HEX_MAP_NORM.get(color_name)
+    if hex_code is not None:
+        return hex_code
     
-    color_upper = color_name.strip().upper()
-    return COLOR_HEX_MAP.get(color_upper, '#808080')
+    return _COLOR_HEX_MAP_NORM.get(color_name.strip().upper(), DEFAULT_COLOR_HEX)
 
 
 def get_color_info(color_name: Optional[str]) -> Dict[str, str]:
@@ -103,7 +121,7 @@ def get_color_info(color_name: Optional[str]) -> Dict[str, str]:
         {'name': 'UNKNOWN', 'hex': '#808080'}
     """
     if not color_name:
-        return {'name': 'UNKNOWN', 'hex': '#808080'}
+        return {'name': 'UNKNOWN', 'hex': DEFAULT_COLOR_HEX}
     
     color_clean = color_name.strip()
     return {
@@ -112,11 +130,11 @@ def get_color_info(color_name: Optional[str]) -> Dict[str, str]:
     }
 
 
-def get_all_colors() -> Dict[str, str]:
+def get_all_colors() -> Mapping[str, str]:
     """
     Retorna todos los colores disponibles con sus códigos hex.
     
     Returns:
-        Diccionario completo de colores
+        Vista de solo lectura del mapeo de colores (usar dict(...) si se necesita modificar)
     """
-    return COLOR_HEX_MAP.copy()
+    return _COLOR_HEX_MAP_VIEW
@@ -4,26 +4,84 @@ Incluye formateo de fechas en español, números, monedas, etc.
 """
 
 from datetime import datetime
-from typing import Optional
-
-
-# Mapeo de meses en español
-MESES_ESPANOL = {
-    1: 'enero',
-    2: 'febrero',
-    3: 'marzo',
-    4: 'abril',
-    5: 'mayo',
-    6: 'junio',
-    7: 'julio',
-    8: 'agosto',
-    9: 'septiembre',
-    10: 'octubre',
-    11: 'noviembre',
-    12: 'diciembre'
+from functools import lru_cache
+from typing import Optional, Tuple
+
+
+# Meses en español indexados por número de mes (índice 0 sin uso)
+MESES_ESPANOL = (
+    '',
+    'enero',
+    'febrero',
+    'marzo',
+    'abril',
+    'mayo',
+    'junio',
+    'julio',
+    'agosto',
+    'septiembre',
+    'octubre',
+    'noviembre',
+    'diciembre'
+)
+
+
+# Símbolos de moneda (incluyen el espacio separador cuando corresponde)
+_CURRENCY_SYMBOLS = {
+    'USD': '$',
+    'PEN': 'S/ ',
+    'EUR': '€',
+    'MXN': 'MX$',
 }
 
 
+def _parse_iso(date_str: str) -> datetime:
+    """
+    Parsea una fecha ISO (YYYY-MM-DD o con hora) a datetime.
+    El caso YYYY-MM-DD se resuelve por slicing sin pasar por strptime.
+    
+    Raises:
+        ValueError: Si el string no es una fecha válida
+    """
+    # ISO con hora: 2026-01-29T10:30:00+00:00
+    if 'T' in date_str:
+        return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+    
+    # Fecha simple: 2026-01-29
+    if (
+        len(date_str) == 10 and date_str[4] == '-' and date_str[7] == '-'
+        and date_str[:4].isdigit() and date_str[5:7].isdigit() and date_str[8:10].isdigit()
+    ):
+        return datetime(int(date_str[:4]), int(date_str[5:7]), int(date_str[8:10]))
+    
+    return datetime.strptime(date_str, '%Y-%m-%d')
+
+
+@lru_cache(maxsize=4096)
+def _date_parts_from_str(date_str: str) -> Optional[Tuple[int, str, int]]:
+    """
+    (día, mes en español, año) de una fecha ISO, o None si no es válida.
+    Cacheado por string: las fechas de una misma respuesta suelen repetirse
+    y ambos formateadores comparten la misma entrada.
+    """
+    try:
+        date_obj = _parse_iso(date_str)
+    except ValueError:
+        return None
+    return date_obj.day, MESES_ESPANOL[date_obj.month], date_obj.year
+
+
+def _date_parts(date_input: Optional[str | datetime]) -> Optional[Tuple[int, str, int]]:
+    """
+    (día, mes en español, año) para un str ISO o datetime; None si no se puede formatear.
+    """
+    if isinstance(date_input, str):
+        return _date_parts_from_str(date_input)
+    if isinstance(date_input, datetime):
+        return date_input.day, MESES_ESPANOL[date_input.month], date_input.year
+    return None
+
+
 def format_date_spanish(date_input: Optional[str | datetime]) -> str:
     """
     Formatea una fecha en español con formato "DD de mes".
@@ -44,31 +102,12 @@ def format_date_spanish(date_input: Optional[str | datetime]) -> str:
         >>> format_date_spanish(None)
         'Sin actualización'
     """
-    if date_input is None:
+    parts = _date_parts(date_input)
+    if parts is None:
         return 'Sin actualización'
     
-    try:
-        # Si es string, parsear a datetime
-        if isinstance(date_input, str):
-            # Intentar parsear diferentes formatos
-            # ISO: 2026-01-29T10:30:00+00:00 o 2026-01-29
-            if 'T' in date_input:
-                date_obj = datetime.fromisoformat(date_input.replace('Z', '+00:00'))
-            else:
-                date_obj = datetime.strptime(date_input, '%Y-%m-%d')
-        elif isinstance(date_input, datetime):
-            date_obj = date_input
-        else:
-            return 'Sin actualización'
-        
-        # Formatear en español
-        day = date_obj.day
-        month = MESES_ESPANOL.get(date_obj.month, '')
-        
-        return f"{day} de {month}"
-    
-    except (ValueError, AttributeError) as e:
-        return 'Sin actualización'
+    day, month, _ = parts
+    return f"{day} de {month}"
 
 
 def format_date_full_spanish(date_input: Optional[str | datetime]) -> str:
@@ -87,28 +126,12 @@ def format_date_full_spanish(date_input: Optional[str | datetime]) -> str:
         >>> format_date_full_spanish(None)
         'Sin fecha'
     """
-    if date_input is None:
+    parts = _date_parts(date_input)
+    if parts is None:
         return 'Sin fecha'
     
-    try:
-        if isinstance(date_input, str):
-            if 'T' in date_input:
-                date_obj = datetime.fromisoformat(date_input.replace('Z', '+00:00'))
-            else:
-                date_obj = datetime.strptime(date_input, '%Y-%m-%d')
-        elif isinstance(date_input, datetime):
-            date_obj = date_input
-        else:
-            return 'Sin fecha'
-        
-        day = date_obj.day
-        month = MESES_ESPANOL.get(date_obj.month, '')
-        year = date_obj.year
-        
-        return f"{day} de {month} de {year}"
-    
-    except (ValueError, AttributeError):
-        return 'Sin fecha'
+    day, month, year = parts
+    return f"{day} de {month} de {year}"
 
 
 def format_currency(amount: Optional[float], currency: str = 'USD') -> str:
@@ -130,19 +153,7 @@ def format_currency(amount: Optional[float], currency: str = 'USD') -> str:
         >>> format_currency(None)
         '$0.00'
     """
-    if amount is None:
-        amount = 0.0
-    
-    symbols = {
-        'USD': '$',
-        'PEN': 'S/',
-        'EUR': '€'
-    }
-    
-    symbol = symbols.get(currency, currency + ' ')
-    formatted = f"{amount:,.2f}"
-    
-    return f"{symbol}{formatted}"
+    return f"{_CURRENCY_SYMBOLS.get(currency, currency + ' ')}{(amount or 0.0):,.2f}"
 
 
 def format_number(number: Optional[int | float]) -> str:
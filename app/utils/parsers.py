@@ -1,5 +1,115 @@
 import re
-from typing import Any, Dict, Optional
+import sys
+from functools import lru_cache
+from typing import Any, Dict, Optional, Pattern, Tuple
+
+# Solo capturan los grupos que se leen con .group(n) o los lookahead que
+# necesitan findall; el resto de alternancias son (?:...)
+# Los cuantificadores posesivos (++, {2,}+; Python 3.11+) no cambian qué coincide:
+# lo que sigue a cada uno nunca puede empezar con el mismo tipo de carácter,
+# solo evitan que el motor retroceda en entradas que no coinciden
+
+# Tamaños de Apple Watch con sufijo MM (41/42/44/45/46/49MM)
+_WATCH_SIZE_MM_RE = re.compile(r'\b(?:41|42|44|45|46|49)\s*MM\b', re.IGNORECASE)
+# Tamaños de Apple Watch con o sin sufijo MM (ej: "46MM", "44 MM", "42")
+_WATCH_SIZE_RE = re.compile(r'\b(41|42|44|45|46|49)\s*(?:MM)?\b', re.IGNORECASE)
+_WATCH_PREFIX_RE = re.compile(r'^WATCH\b')
+_CAPACITY_RE = re.compile(r'\b\d++(?:GB|TB|MB)\b', re.IGNORECASE)
+_CPU_RE = re.compile(r'\b(\d++)C\s++CPU\b', re.IGNORECASE)
+_GPU_RE = re.compile(r'\b(\d++C(?:/\d++C)?)\s++GPU\b', re.IGNORECASE)
+_COUNTRY_RE = re.compile(r'[-/]([A-Z]{2,}+(?:\s++[A-Z]++)?)$')
+
+# Los valores de vocabulario que terminan en el resultado (marcas, colores) se
+# internan con sys.intern: todos los resultados comparten el mismo objeto str
+# (hash ya calculado, comparación por identidad en lookups posteriores)
+
+# Mapeo de siglas a colores (principalmente para MacBooks)
+_COLOR_ABBREVIATIONS = {abbr: sys.intern(color) for abbr, color in {
+    'PNK': 'PINK',
+    'SG': 'SPACE GRAY',
+    'RG': 'ROSE GOLD',
+    'JB': 'JET BLACK',
+    'MB': 'MIDNIGHT BLACK',
+    'SL': 'SILVER',
+    'GD': 'GOLD',
+    'BK': 'BLACK',
+    'WH': 'WHITE',
+    'MN': 'MIDNIGHT',
+    'ST': 'STARLIGHT',
+    'AB': 'ALPINE BLUE',
+    'DB': 'DEEP BLUE',
+    'SPB': 'SPACE BLACK',
+    'NT': 'NATURAL',
+    'SLV': 'SILVER',
+    'SLVR': 'SILVER',
+    'SBLK': 'SPACE BLACK',
+    'SB': 'SPACE BLACK',
+}.items()}
+_COLOR_ABBREVIATION_PRIORITY = {abbr: i for i, abbr in enumerate(_COLOR_ABBREVIATIONS)}
+# La sigla como palabra independiente seguida de espacio, /, número o fin de string.
+# Como tras la sigla no puede venir otra letra, en cada posición coincide a lo sumo una
+_COLOR_ABBREVIATION_RE = re.compile(
+    r'\b(?:' + '|'.join(re.escape(abbr) for abbr in _COLOR_ABBREVIATIONS) + r')(?=[\s/\d]|$)'
+)
+_COLOR_ABBREVIATION_PATTERNS = {
+    abbr: re.compile(rf'\b{re.escape(abbr)}(?=[\s/\d]|$)')
+    for abbr in _COLOR_ABBREVIATIONS
+}
+
+# Colores completos; ordenados por longitud descendente para que los más
+# específicos (SPACE BLACK) tengan prioridad sobre los genéricos (BLACK)
+_COLORS = tuple(sys.intern(color) for color in sorted([
+    'BLACK', 'WHITE', 'SILVER', 'GOLD', 'ROSE GOLD', 'SPACE GRAY', 'SPACE GREY',
+    'MIDNIGHT', 'STARLIGHT', 'DEEP BLUE', 'RED', 'GREEN', 'YELLOW', 'PURPLE', 'PINK',
+    'CORANGE', 'GRAPHITE', 'SIERRA BLUE', 'ALPINE GREEN', 'DEEP PURPLE','SAGE','DBLUE',
+    'TITANIUM', 'NATURAL TITANIUM', 'BLUE TITANIUM', 'WHITE TITANIUM', 'BLACK TITANIUM','BLU',
+    'SKY BLUE', 'SPACE BLACK', 'MIDNIGHT BLACK', 'ALPINE BLUE', 'MIST BLUE','LAVENDER', 'BLUE',
+], key=len, reverse=True))
+_COLOR_PRIORITY = {color: i for i, color in enumerate(_COLORS)}
+# Una sola pasada sobre el string: el lookahead encuentra en cada posición el color
+# de mayor prioridad que empieza ahí (incluidos solapados, ej: SPACE BLACK TITANIUM)
+_COLOR_RE = re.compile('(?=(' + '|'.join(re.escape(color) for color in _COLORS) + '))')
+
+# Marcas al inicio del string; las que comparten prefijo van primero las más largas
+# (MACBOOK antes que MAC) para que gane la más específica
+_BRAND_RE = re.compile(r'(?:APPLE (?:PENCIL|WATCH|TV)|MACBOOK|AIRPODS|IPHONE|IPAD|MAC)')
+_BRANDS = {brand: sys.intern(brand) for brand in (
+    'APPLE PENCIL', 'APPLE WATCH', 'APPLE TV', 'MACBOOK', 'AIRPODS', 'IPHONE', 'IPAD', 'MAC'
+)}
+
+# Accesorios -> marca asignada; el orden del dict define la prioridad
+_ACCESSORIES = {pattern: sys.intern(brand) for pattern, brand in {
+    'MAGIC KEYBOARD': 'KEYBOARD',
+    'SMART KEYBOARD': 'KEYBOARD',
+    'KEYBOARD FOLIO': 'KEYBOARD',
+    'SMART FOLIO': 'FOLIO',
+    'MAGSAFE CHARGER': 'CHARGER',
+    'MAGSAFE BATTERY': 'BATTERY PACK',
+    'AIRTAG': 'AIRTAG',
+}.items()}
+_ACCESSORY_PRIORITY = {pattern: i for i, pattern in enumerate(_ACCESSORIES)}
+_ACCESSORY_RE = re.compile('(?=(' + '|'.join(re.escape(pattern) for pattern in _ACCESSORIES) + '))')
+# Prefijo de producto a remover de los accesorios (ej: "IPAD MAGIC KEYBOARD")
+_ACCESSORY_PREFIX_RE = re.compile(r'(?:IPAD|APPLE|IPHONE|MACBOOK) ')
+
+
+def _capacity_to_gb(cap_str: str) -> int:
+    """
+    Tamaño en GB de una capacidad ya validada por _CAPACITY_RE (ej: '512GB', '1TB').
+    Las capacidades en MB cuentan como 0 para que nunca se tomen como almacenamiento.
+    """
+    unit = cap_str[-2:]
+    if unit == 'GB':
+        return int(cap_str[:-2])
+    if unit == 'TB':
+        return int(cap_str[:-2]) * 1024
+    return 0
+
+
+@lru_cache(maxsize=32)
+def _brand_mention_re(brand: str) -> Pattern[str]:
+    """Patrón compilado para remover menciones de la marca dentro del modelo"""
+    return re.compile(r'\b' + re.escape(brand) + r'\b', re.IGNORECASE)
 
 
 def clean_apple_watch_model(name: Optional[str]) -> Optional[str]:
@@ -20,19 +130,30 @@ def clean_apple_watch_model(name: Optional[str]) -> Optional[str]:
     """
     if not name or not isinstance(name, str):
         return name
-    cleaned = re.sub(r'\b(41|42|44|45|46|49)\s*MM\b', '', name, flags=re.IGNORECASE)
-    cleaned = re.sub(r'\s+', ' ', cleaned).strip()
+    if 'MM' not in name.upper():
+        # Sin "MM" no hay tamaño que quitar: solo se normalizan los espacios
+        return " ".join(name.split())
+    cleaned = " ".join(_WATCH_SIZE_MM_RE.sub('', name).split())
     return cleaned or name.strip()
 
+# Claves del dict devuelto por parse_model_description (en orden)
+_PARSED_MODEL_KEYS = ('brand', 'model', 'color', 'capacity', 'ram', 'chip', 'country', 'full_model')
+
+# Tipos escalares que produce json.loads (se copian tal cual en normalize_keys)
+_JSON_SCALAR_TYPES = frozenset({str, int, float, bool, type(None)})
+
 
 def normalize_keys(obj: Any) -> Any:
     """
-    Normaliza recursivamente las claves de diccionarios reemplazando espacios con guiones bajos
+    Normaliza las claves de diccionarios (en todos los niveles) reemplazando espacios con guiones bajos
     
     Ejemplos:
         'Serial Number' -> 'Serial_Number'
         'iCloud Lock' -> 'iCloud_Lock'
     
+    Recorre el JSON con una pila explícita en lugar de recursión, así que la
+    profundidad del documento no depende del límite de recursión de Python.
+    
     Args:
         obj: Diccionario, lista o valor a normalizar
         
@@ -40,24 +161,60 @@ def normalize_keys(obj: Any) -> Any:
         Objeto con keys normalizadas
     """
     if isinstance(obj, dict):
-        normalized = {}
-        for key, value in obj.items():
-            # Solo operar en keys que son strings
-            if isinstance(key, str):
-                # Reemplazar espacios múltiples con underscore
-                new_key = re.sub(r"\s+", "_", key.strip())
-            else:
-                new_key = key
-            
-            # Recursión para valores anidados
-            normalized[new_key] = normalize_keys(value)
-        return normalized
-    
+        root: Any = {}
     elif isinstance(obj, list):
-        return [normalize_keys(item) for item in obj]
-    
+        root = []
     else:
         return obj
+    
+    # Pares (original, copia normalizada a rellenar)
+    stack = [(obj, root)]
+    push = stack.append
+    pop = stack.pop
+    join_underscore = "_".join
+    while stack:
+        source, target = pop()
+        
+        if isinstance(source, dict):
+            for key, value in source.items():
+                # Solo operar en keys que son strings
+                if type(key) is str or isinstance(key, str):
+                    # Reemplazar espacios múltiples con underscore
+                    # split() sin argumentos ya descarta espacios al inicio/final y colapsa
+                    # secuencias; con una sola palabra join devuelve la misma key sin copiarla
+                    key = join_underscore(key.split())
+                
+                # Escalares JSON: comparación de tipo exacto, sin recorrer el MRO
+                value_type = type(value)
+                if value_type in _JSON_SCALAR_TYPES:
+                    target[key] = value
+                # Valores anidados: se crea el contenedor y se rellena más adelante
+                elif value_type is dict or isinstance(value, dict):
+                    target[key] = child = {}
+                    push((value, child))
+                elif value_type is list or isinstance(value, list):
+                    target[key] = child = []
+                    push((value, child))
+                else:
+                    target[key] = value
+        else:
+            append = target.append
+            for item in source:
+                item_type = type(item)
+                if item_type in _JSON_SCALAR_TYPES:
+                    append(item)
+                elif item_type is dict or isinstance(item, dict):
+                    child = {}
+                    push((item, child))
+                    append(child)
+                elif item_type is list or isinstance(item, list):
+                    child = []
+                    push((item, child))
+                    append(child)
+                else:
+                    append(item)
+    
+    return root
 
 
 def parse_model_description(model_desc: str) -> Dict[str, Optional[str]]:
@@ -74,8 +231,23 @@ def parse_model_description(model_desc: str) -> Dict[str, Optional[str]]:
         "IPHONE 17 PRO MAX SILVER 512GB-USA"
         -> {'brand': 'IPHONE', 'model': '17 PRO MAX', 'color': 'SILVER',
             'capacity': '512GB', 'ram': None, ...}
-    """
     
+    Los resultados se cachean por descripción (las mismas descripciones se
+    repiten entre unidades del mismo SKU); cada llamada devuelve un dict nuevo.
+    """
+    if not model_desc or model_desc.isspace():
+        return dict.fromkeys(_PARSED_MODEL_KEYS)
+    return dict(zip(_PARSED_MODEL_KEYS, _parse_model_description_cached(model_desc)))
+
+
+@lru_cache(maxsize=8192)
+def _parse_model_description_cached(model_desc: str) -> Tuple[Optional[str], ...]:
+    """Resultado de _parse_model_description como tupla inmutable (cacheable)"""
+    return tuple(_parse_model_description(model_desc).values())
+
+
+def _parse_model_description(model_desc: str) -> Dict[str, Optional[str]]:
+    """Implementación sin cache de parse_model_description"""
     result: Dict[str, Optional[str]] = {
         'brand': None,
         'model': None,
@@ -95,63 +267,37 @@ def parse_model_description(model_desc: str) -> Dict[str, Optional[str]]:
 
     # Normalización Apple Watch: algunas fuentes devuelven "WATCH ..." sin el prefijo "APPLE"
     # Ejemplo: "WATCH SERIES 11 (GPS) ALUMINUM 46MM" -> "APPLE WATCH SERIES 11 (GPS) ALUMINUM 46MM"
-    if re.match(r'^WATCH\b', desc):
+    if _WATCH_PREFIX_RE.match(desc):
         desc = f"APPLE {desc}"
     original_desc = desc  # Guardar copia para encontrar capacidades
     
     # 0. ACCESORIOS: Detectar accesorios ANTES de marcas para evitar confusión
     # Ejemplo: "IPAD MAGIC KEYBOARD 13 BLACK-USA" -> brand: KEYBOARD, model: MAGIC KEYBOARD 13
-    accessories = {
-        'MAGIC KEYBOARD': 'KEYBOARD',
-        'SMART KEYBOARD': 'KEYBOARD',
-        'KEYBOARD FOLIO': 'KEYBOARD',
-        'SMART FOLIO': 'FOLIO',
-        'MAGSAFE CHARGER': 'CHARGER',
-        'MAGSAFE BATTERY': 'BATTERY PACK',
-        'AIRTAG': 'AIRTAG',
-    }
-    
     detected_accessory = None
-    for accessory_pattern, accessory_brand in accessories.items():
-        if accessory_pattern in desc:
-            detected_accessory = accessory_brand
-            # Remover prefijo de producto (IPAD, APPLE, etc.) si existe al inicio
-            prefixes_to_remove = ['IPAD ', 'APPLE ', 'IPHONE ', 'MACBOOK ']
-            for prefix in prefixes_to_remove:
-                if desc.startswith(prefix):
-                    desc = desc[len(prefix):].strip()
-                    break
-            result['brand'] = detected_accessory
-            break
+    accessory_matches = _ACCESSORY_RE.findall(desc)
+    if accessory_matches:
+        accessory_pattern = min(accessory_matches, key=_ACCESSORY_PRIORITY.__getitem__)
+        detected_accessory = _ACCESSORIES[accessory_pattern]
+        # Remover prefijo de producto (IPAD, APPLE, etc.) si existe al inicio
+        prefix_match = _ACCESSORY_PREFIX_RE.match(desc)
+        if prefix_match:
+            desc = desc[prefix_match.end():].strip()
+        result['brand'] = detected_accessory
     
     # 1. MARCA: Detectar si empieza con IPHONE, APPLE TV, MAC, etc (solo si no es accesorio)
     if not detected_accessory:
-        brands = [
-            'APPLE TV', 'APPLE WATCH', 'IPHONE', 'IPAD', 'MACBOOK', 'AIRPODS','APPLE PENCIL', 'MAC'
-        ]
-        brands.sort(key=len, reverse=True)
-        
-        for brand in brands:
-            if desc.startswith(brand):
-                result['brand'] = brand
-                desc = desc[len(brand):].strip()
-                break
+        brand_match = _BRAND_RE.match(desc)
+        if brand_match:
+            result['brand'] = _BRANDS[brand_match.group()]
+            desc = desc[brand_match.end():].strip()
     
     # 2. MÚLTIPLES CAPACIDADES: Buscar TODAS las capacidades (GB/TB/MB)
-    capacities = re.findall(r'\b(\d+(?:GB|TB|MB))\b', original_desc, re.IGNORECASE)
+    capacities = _CAPACITY_RE.findall(original_desc)
     capacities = [c.upper() for c in capacities]
     
     if len(capacities) >= 2 and (result['brand'] == 'MACBOOK' or result['brand'] == 'MAC'):
         # MacBook: ordenar y asignar RAM (menor) y almacenamiento (mayor)
-        def capacity_to_mb(cap_str: str) -> int:
-            match = re.match(r'(\d+)(GB|TB)', cap_str)
-            if match:
-                value = int(match.group(1))
-                unit = match.group(2)
-                return value * 1024 if unit == 'TB' else value
-            return 0
-        
-        sorted_caps = sorted(set(capacities), key=capacity_to_mb)
+        sorted_caps = sorted(set(capacities), key=_capacity_to_gb)
         result['ram'] = sorted_caps[0]  # Menor = RAM
         result['capacity'] = sorted_caps[-1]  # Mayor = almacenamiento
     elif capacities:
@@ -159,110 +305,80 @@ def parse_model_description(model_desc: str) -> Dict[str, Optional[str]]:
         result['capacity'] = capacities[-1]
     
     # Remover todas las capacidades encontradas del string
+    # (las capacidades no contienen espacios: basta un strip al final)
     desc_temp = original_desc
-    for cap in capacities:
-        desc_temp = desc_temp.replace(cap, '').strip()
+    if capacities:
+        for cap in capacities:
+            desc_temp = desc_temp.replace(cap, '')
+        desc_temp = desc_temp.strip()
 
     # Apple Watch: extraer tamaño (41/42/44/45/46/49mm) como capacidad y removerlo del modelo
     if result['brand'] == 'APPLE WATCH':
-        size_match = re.search(r'\b(41|42|44|45|46|49)\s*(?:MM)?\b', original_desc, re.IGNORECASE)
+        size_match = _WATCH_SIZE_RE.search(original_desc)
         if size_match:
-            size_value = f"{size_match.group(1).upper()}MM"
-            result['capacity'] = size_value
-            # Quitar cualquier referencia al tamaño para que no quede en el modelo
-            desc_temp = re.sub(r'\b(41|42|44|45|46|49)\s*(?:MM)?\b', '', desc_temp, flags=re.IGNORECASE)
-            desc_temp = re.sub(r'\s+', ' ', desc_temp).strip()
+            result['capacity'] = f"{size_match.group(1)}MM"
+            # Quitar cualquier referencia al tamaño para que no quede en el modelo.
+            # Si no se removieron capacidades, desc_temp es original_desc y el texto
+            # antes del primer match ya se sabe libre de tamaños: solo se recorre el resto
+            if desc_temp is original_desc:
+                start = size_match.start()
+                desc_temp = original_desc[:start] + _WATCH_SIZE_RE.sub('', original_desc[start:])
+            else:
+                desc_temp = _WATCH_SIZE_RE.sub('', desc_temp)
+            desc_temp = " ".join(desc_temp.split())
 
     desc = desc_temp
 
     # 2b. CHIP: Extraer CPU + GPU para MacBooks/Macs (ej: "10C CPU 8C GPU" → "10C CPU / 8C GPU")
     if result['brand'] in ('MACBOOK', 'MAC'):
-        cpu_match = re.search(r'\b(\d+)C\s+CPU\b', desc, re.IGNORECASE)
-        gpu_match = re.search(r'\b(\d+C(?:/\d+C)?)\s+GPU\b', desc, re.IGNORECASE)
+        cpu_match = _CPU_RE.search(desc)
+        gpu_match = _GPU_RE.search(desc)
         if cpu_match and gpu_match:
             cpu_part = f"{cpu_match.group(1)}C CPU"
             gpu_part = f"{gpu_match.group(1).upper()} GPU"
             result['chip'] = f"{cpu_part} / {gpu_part}"
             # Remove both tokens from desc
-            desc = re.sub(r'\b\d+C\s+CPU\b', '', desc, flags=re.IGNORECASE)
-            desc = re.sub(r'\b\d+C(?:/\d+C)?\s+GPU\b', '', desc, flags=re.IGNORECASE)
-            desc = re.sub(r'\s+', ' ', desc).strip()
+            desc = _CPU_RE.sub('', desc)
+            desc = _GPU_RE.sub('', desc)
+            desc = " ".join(desc.split())
         elif gpu_match:
             result['chip'] = f"{gpu_match.group(1).upper()} GPU"
-            desc = re.sub(r'\b\d+C(?:/\d+C)?\s+GPU\b', '', desc, flags=re.IGNORECASE)
-            desc = re.sub(r'\s+', ' ', desc).strip()
+            desc = _GPU_RE.sub('', desc)
+            desc = " ".join(desc.split())
 
     # 3. PAÍS: Buscar después de guión o al final (ej: -USA, -CHINA)
-    country_match = re.search(r'[-/]([A-Z]{2,}(?:\s+[A-Z]+)?)$', desc)
+    country_match = _COUNTRY_RE.search(desc)
     if country_match:
         result['country'] = country_match.group(1).strip()
         # Remover país del string
         desc = desc[:country_match.start()].strip()
     
     # 4. COLOR: Buscar colores comunes Y SIGLAS DE COLORES (especialmente para MacBooks)
-    # Mapeo de siglas a colores (principalmente para MacBooks)
-    color_abbreviations = {
-        'PNK': 'PINK',
-        'SG': 'SPACE GRAY',
-        'RG': 'ROSE GOLD',
-        'JB': 'JET BLACK',
-        'MB': 'MIDNIGHT BLACK',
-        'SL': 'SILVER',
-        'GD': 'GOLD',
-        'BK': 'BLACK',
-        'WH': 'WHITE',
-        'MN': 'MIDNIGHT',
-        'ST': 'STARLIGHT',
-        'AB': 'ALPINE BLUE',
-        'DB': 'DEEP BLUE',
-        'SPB': 'SPACE BLACK',
-        'NT': 'NATURAL',
-        'SLV': 'SILVER',
-        'SLVR': 'SILVER',
-        'SBLK': 'SPACE BLACK',
-        'SB': 'SPACE BLACK',
-    }
-    
-    colors = [
-        'BLACK', 'WHITE', 'SILVER', 'GOLD', 'ROSE GOLD', 'SPACE GRAY', 'SPACE GREY',
-        'MIDNIGHT', 'STARLIGHT', 'DEEP BLUE', 'RED', 'GREEN', 'YELLOW', 'PURPLE', 'PINK',
-        'CORANGE', 'GRAPHITE', 'SIERRA BLUE', 'ALPINE GREEN', 'DEEP PURPLE','SAGE','DBLUE',
-        'TITANIUM', 'NATURAL TITANIUM', 'BLUE TITANIUM', 'WHITE TITANIUM', 'BLACK TITANIUM','BLU',
-        'SKY BLUE', 'SPACE BLACK', 'MIDNIGHT BLACK', 'ALPINE BLUE', 'MIST BLUE','LAVENDER', 'BLUE',
-    ]
-    
-    # Ordenar por longitud descendente para los más específicos primero
-    colors.sort(key=len, reverse=True)
-    
-    # Primero intentar colores completos
-    for color in colors:
-        # Buscar el color al final o antes de otros tokens
-        if color in desc:
-            result['color'] = color
-            # Remover color del string
-            desc = desc.replace(color, '').strip()
-            break
+    # Primero intentar colores completos: el de mayor prioridad presente en desc
+    color_matches = _COLOR_RE.findall(desc)
+    if color_matches:
+        color = _COLORS[min(map(_COLOR_PRIORITY.__getitem__, color_matches))]
+        result['color'] = color
+        # Remover color del string
+        desc = desc.replace(color, '').strip()
     
     # Si no encontró color completo, buscar siglas de colores (ej: SB para Space Black)
     if not result['color']:
-        for abbr, full_color in color_abbreviations.items():
-            # Buscar la sigla como palabra independiente o seguida de números/caracteres
-            # Patrón: la sigla seguida de /número o espacio o fin de string
-            pattern = rf'\b{re.escape(abbr)}(?=[\s/\d]|$)'
-            if re.search(pattern, desc):
-                result['color'] = full_color
-                # Remover la sigla del string
-                desc = re.sub(pattern, '', desc).strip()
-                break
+        abbr_matches = _COLOR_ABBREVIATION_RE.findall(desc)
+        if abbr_matches:
+            abbr = min(abbr_matches, key=_COLOR_ABBREVIATION_PRIORITY.__getitem__)
+            result['color'] = _COLOR_ABBREVIATIONS[abbr]
+            # Remover la sigla del string
+            desc = _COLOR_ABBREVIATION_PATTERNS[abbr].sub('', desc).strip()
     
     # 5. MODELO: Lo que queda es el modelo (sin marca, color, capacidades, país)
-    desc = re.sub(r'\s+', ' ', desc).strip()
+    desc = " ".join(desc.split())
     
     # Remover menciones adicionales de la marca dentro del modelo para evitar duplicación
     if result['brand'] and desc:
         # Remover todas las ocurrencias de la marca (case insensitive)
-        desc = re.sub(r'\b' + re.escape(result['brand']) + r'\b', '', desc, flags=re.IGNORECASE).strip()
-        desc = re.sub(r'\s+', ' ', desc).strip()
+        desc = _brand_mention_re(result['brand']).sub('', desc).strip()
+        desc = " ".join(desc.split())
     
     if desc:
         result['model'] = desc
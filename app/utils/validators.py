@@ -3,8 +3,16 @@ Validadores para datos de entrada (IMEI, Serial Number, etc.)
 Centraliza toda la lógica de validación del sistema
 """
 
-import re
-from typing import Dict, Any, Tuple
+from functools import lru_cache
+from typing import Dict, Any, Final, Tuple
+
+# Luhn: tabla bytes.translate que lleva cada dígito ASCII d a 2*d ya reducido
+# (restando 9 si supera 9), también en ASCII: '0123456789' -> '0246813579'
+_LUHN_DOUBLE_ASCII = bytes.maketrans(b'0123456789', b'0246813579')
+_LUHN_ASCII_OFFSET = ord('0') * 15  # Suma de los 15 '0' a descontar
+
+# Claves del dict que retorna DeviceInputValidator.validate (en orden)
+_DEVICE_VALIDATION_KEYS = ('valid', 'type', 'cleaned_value', 'message')
 
 class ValidationError(Exception):
     """Excepción personalizada para errores de validación"""
@@ -31,40 +39,36 @@ class IMEIValidator:
         # Limpiar espacios y guiones
         imei_clean = imei.replace(' ', '').replace('-', '')
         
-        # Debe tener exactamente 15 dígitos
-        return bool(re.match(r'^\d{15}$', imei_clean))
+        # Debe tener exactamente 15 dígitos ASCII (sin regex: len + isdigit son llamadas en C)
+        return len(imei_clean) == 15 and imei_clean.isascii() and imei_clean.isdigit()
     
     @staticmethod
-    def luhn_check(imei: str) -> bool:
+    @lru_cache(maxsize=8192)
+    def luhn_check(imei: str, assume_valid_format: bool = False) -> bool:
         """
         Valida el dígito de control usando el algoritmo de Luhn
         
         Args:
             imei: String con el IMEI (15 dígitos)
+            assume_valid_format: Si el IMEI ya viene limpio y con formato validado
             
         Returns:
             bool: True si pasa la validación de Luhn
         """
-        imei_clean = imei.replace(' ', '').replace('-', '')
-        
-        if not re.match(r'^\d{15}$', imei_clean):
-            return False
-        
-        # Algoritmo de Luhn
-        digits = [int(d) for d in imei_clean]
-        check_digit = digits[-1]
-        imei_without_check = digits[:-1]
-        
-        # Duplicar cada segundo dígito de derecha a izquierda
-        for i in range(len(imei_without_check) - 1, -1, -2):
-            imei_without_check[i] *= 2
-            if imei_without_check[i] > 9:
-                imei_without_check[i] -= 9
+        if assume_valid_format:
+            imei_clean = imei
+        else:
+            imei_clean = imei.replace(' ', '').replace('-', '')
+            
+            if not (len(imei_clean) == 15 and imei_clean.isascii() and imei_clean.isdigit()):
+                return False
         
-        total = sum(imei_without_check)
-        calculated_check = (10 - (total % 10)) % 10
+        # Algoritmo de Luhn sobre los bytes ASCII: de derecha a izquierda se duplica
+        # cada segundo dígito sin contar el de control (posiciones impares 1..13)
+        buf = imei_clean.encode('ascii')
+        total = sum(buf[1:14:2].translate(_LUHN_DOUBLE_ASCII)) + sum(buf[0:14:2]) + buf[14]
         
-        return calculated_check == check_digit
+        return (total - _LUHN_ASCII_OFFSET) % 10 == 0
     
     @staticmethod
     def validate(imei: str, check_luhn: bool = True) -> Tuple[bool, str]:
@@ -83,10 +87,26 @@ class IMEIValidator:
         
         imei_clean = imei.replace(' ', '').replace('-', '')
         
-        if not IMEIValidator.is_valid_format(imei):
+        if check_luhn:
+            return IMEIValidator.validate_with_luhn(imei_clean)
+        return IMEIValidator.validate_format_only(imei_clean)
+    
+    @staticmethod
+    def validate_format_only(imei_clean: str) -> Tuple[bool, str]:
+        """Valida solo el formato (15 dígitos) de un IMEI ya limpio, sin Luhn"""
+        if not (len(imei_clean) == 15 and imei_clean.isascii() and imei_clean.isdigit()):
             return False, "IMEI debe tener exactamente 15 dígitos"
         
-        if check_luhn and not IMEIValidator.luhn_check(imei_clean):
+        return True, "IMEI válido"
+    
+    @staticmethod
+    def validate_with_luhn(imei_clean: str) -> Tuple[bool, str]:
+        """Valida formato y dígito de control (Luhn) de un IMEI ya limpio"""
+        is_valid, message = IMEIValidator.validate_format_only(imei_clean)
+        if not is_valid:
+            return is_valid, message
+        
+        if not IMEIValidator.luhn_check(imei_clean, assume_valid_format=True):
             return False, "IMEI no pasa validación de Luhn (dígito de control incorrecto)"
         
         return True, "IMEI válido"
@@ -95,12 +115,12 @@ class IMEIValidator:
 class SerialNumberValidator:
     """Validador para números de serie de Apple"""
     
-    # Formatos conocidos de serial numbers de Apple
-    FORMATS = {
-        'compact': r'^[A-Z0-9]{10}$',  # Formato compacto (10 caracteres)
-        'old': r'^[A-Z0-9]{11}$',      # Formato antiguo (11 caracteres)
-        'new': r'^[A-Z0-9]{12}$',      # Formato nuevo (12 caracteres)
-        'imac': r'^[A-Z0-9]{13}$',     # iMac y algunos Mac (13 caracteres)
+    # Formatos conocidos de serial numbers de Apple (todos [A-Z0-9], solo cambia la longitud)
+    FORMAT_LENGTHS = {
+        10: 'compact',  # Formato compacto (10 caracteres)
+        11: 'old',      # Formato antiguo (11 caracteres)
+        12: 'new',      # Formato nuevo (12 caracteres)
+        13: 'imac',     # iMac y algunos Mac (13 caracteres)
     }
     
     @staticmethod
@@ -119,12 +139,12 @@ class SerialNumberValidator:
         
         serial_clean = serial.strip().upper()
         
-        # Verificar contra formatos conocidos
-        for format_name, pattern in SerialNumberValidator.FORMATS.items():
-            if re.match(pattern, serial_clean):
-                return True
-        
-        return False
+        # Verificar contra formatos conocidos: longitud válida y solo [A-Z0-9]
+        return (
+            len(serial_clean) in SerialNumberValidator.FORMAT_LENGTHS
+            and serial_clean.isascii()
+            and serial_clean.isalnum()
+        )
     
     @staticmethod
     def validate(serial: str) -> Tuple[bool, str]:
@@ -140,8 +160,11 @@ class SerialNumberValidator:
         if not serial:
             return False, "Serial number vacío"
         
-        serial_clean = serial.strip().upper()
-        
+        return SerialNumberValidator._validate_clean(serial.strip().upper())
+    
+    @staticmethod
+    def _validate_clean(serial_clean: str) -> Tuple[bool, str]:
+        """Validación de un serial number ya normalizado (strip + upper)"""
         if len(serial_clean) < 8:
             return False, "Serial number demasiado corto (mínimo 8 caracteres)"
         
@@ -149,10 +172,10 @@ class SerialNumberValidator:
             return False, "Serial number demasiado largo (máximo 20 caracteres)"
         
         # Validar caracteres alfanuméricos
-        if not re.match(r'^[A-Z0-9]+$', serial_clean):
+        if not (serial_clean.isascii() and serial_clean.isalnum()):
             return False, "Serial number solo debe contener letras y números"
         
-        if not SerialNumberValidator.is_valid_format(serial_clean):
+        if len(serial_clean) not in SerialNumberValidator.FORMAT_LENGTHS:
             return False, f"Formato de serial number no reconocido (longitud: {len(serial_clean)})"
         
         return True, "Serial number válido"
@@ -175,14 +198,21 @@ class DeviceInputValidator:
         if not input_value:
             return 'unknown'
         
-        clean_value = input_value.replace(' ', '').replace('-', '').strip()
+        clean_value = input_value.replace(' ', '').replace('-', '').strip().upper()
+        return DeviceInputValidator._detect_clean_type(clean_value)
+    
+    @staticmethod
+    def _detect_clean_type(clean_value: str) -> str:
+        """Detecta el tipo sobre un valor ya limpio y en mayúsculas"""
+        # La longitud descarta la mayoría de inputs antes de revisar caracteres
+        n = len(clean_value)
         
         # Si son 15 dígitos, probablemente es IMEI
-        if re.match(r'^\d{15}$', clean_value):
+        if n == 15 and clean_value.isascii() and clean_value.isdigit():
             return 'imei'
         
-        # Si tiene letras y números, probablemente es serial
-        if re.match(r'^[A-Z0-9]{8,20}$', clean_value.upper()):
+        # Si tiene letras y números (8 a 20, ya en mayúsculas), probablemente es serial
+        if 8 <= n <= 20 and clean_value.isascii() and clean_value.isalnum():
             return 'serial'
         
         return 'unknown'
@@ -204,60 +234,63 @@ class DeviceInputValidator:
                 'message': str
             }
         """
+        # El resultado se cachea como tupla inmutable; cada llamada recibe un dict nuevo
+        return dict(zip(
+            _DEVICE_VALIDATION_KEYS,
+            DeviceInputValidator._validate_cached(input_value, expected_type)
+        ))
+    
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _validate_cached(input_value: str, expected_type) -> Tuple[bool, str, str, str]:
+        """Valida el input y retorna (valid, type, cleaned_value, message)"""
         if not input_value or not input_value.strip():
-            return {
-                'valid': False,
-                'type': 'unknown',
-                'cleaned_value': '',
-                'message': 'Input vacío'
-            }
+            return False, 'unknown', '', 'Input vacío'
         
         cleaned = input_value.replace(' ', '').replace('-', '').strip().upper()
         
-        # Auto-detectar tipo si no se especifica
+        # Auto-detectar tipo si no se especifica. Si se detectó, el formato ya está
+        # confirmado sobre el mismo valor limpio y no hace falta re-validarlo.
         if not expected_type:
-            detected_type = DeviceInputValidator.detect_type(input_value)
+            detected_type = DeviceInputValidator._detect_clean_type(cleaned)
+            format_checked = True
         else:
             detected_type = expected_type
+            format_checked = False
         
         # Validar según el tipo
         if detected_type == 'imei':
-            is_valid, message = IMEIValidator.validate(cleaned, check_luhn=False)
-            return {
-                'valid': is_valid,
-                'type': 'imei',
-                'cleaned_value': cleaned,
-                'message': message
-            }
+            # Solo formato: el endpoint de consulta no exige el dígito de control
+            if format_checked:
+                is_valid, message = IMEIValidator.validate_format_only(cleaned)
+            else:
+                is_valid, message = IMEIValidator.validate(cleaned, check_luhn=False)
+            return is_valid, 'imei', cleaned, message
         
         elif detected_type == 'serial':
-            is_valid, message = SerialNumberValidator.validate(cleaned)
-            return {
-                'valid': is_valid,
-                'type': 'serial',
-                'cleaned_value': cleaned,
-                'message': message
-            }
+            if format_checked:
+                is_valid, message = SerialNumberValidator._validate_clean(cleaned)
+            else:
+                is_valid, message = SerialNumberValidator.validate(cleaned)
+            return is_valid, 'serial', cleaned, message
         
         else:
-            return {
-                'valid': False,
-                'type': 'unknown',
-                'cleaned_value': cleaned,
-                'message': 'No se pudo detectar el tipo de input (IMEI o Serial)'
-            }
+            return False, 'unknown', cleaned, 'No se pudo detectar el tipo de input (IMEI o Serial)'
 
 
 class InventoryValidator:
     """Validadores para operaciones de inventario"""
     
+    _MAX_STOCK: Final = 10_000
+    _MAX_PRECIO: Final = 1_000_000
+    
     @staticmethod
     def validate_stock(cantidad: int) -> Tuple[bool, str]:
         """Valida cantidad de stock"""
         if cantidad < 0:
             return False, "La cantidad no puede ser negativa"
-        if cantidad > 10000:
-            return False, "Cantidad excesiva (máximo 10,000)"
+        if cantidad > InventoryValidator._MAX_STOCK:
+            return False, f"Cantidad excesiva (máximo {InventoryValidator._MAX_STOCK:,})"
         return True, "Cantidad válida"
     
     @staticmethod
@@ -265,8 +298,8 @@ class InventoryValidator:
         """Valida precio"""
         if precio < 0:
             return False, "El precio no puede ser negativo"
-        if precio > 1000000:
-            return False, "Precio excesivo (máximo $1,000,000)"
+        if precio > InventoryValidator._MAX_PRECIO:
+            return False, f"Precio excesivo (máximo ${InventoryValidator._MAX_PRECIO:,})"
         return True, "Precio válido"
     
     @staticmethod
@@ -281,7 +314,8 @@ class InventoryValidator:
     @staticmethod
     def validate_venta(data: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Valida todos los campos necesarios para una venta
+        Valida todos los campos necesarios para una venta.
+        Si faltan campos obligatorios retorna solo esos errores, sin evaluar el resto.
         
         Args:
             data: Dict con los datos de la venta
@@ -293,27 +327,29 @@ class InventoryValidator:
                 'warnings': List[str]
             }
         """
+        inventario_id = data.get('inventario_id')
+        precio_venta = data.get('precio_venta')
+        
+        # Validaciones obligatorias (corta aquí si falta alguna)
+        if not inventario_id or not precio_venta:
+            errors = []
+            if not inventario_id:
+                errors.append("inventario_id es obligatorio")
+            if not precio_venta:
+                errors.append("precio_venta es obligatorio")
+            return {'valid': False, 'errors': errors, 'warnings': []}
+        
         errors = []
         warnings = []
         
-        # Validaciones obligatorias
-        if not data.get('inventario_id'):
-            errors.append("inventario_id es obligatorio")
-        
-        if not data.get('precio_venta'):
-            errors.append("precio_venta es obligatorio")
-        else:
-            is_valid, msg = InventoryValidator.validate_precio(data['precio_venta'])
-            if not is_valid:
-                errors.append(msg)
+        is_valid, msg = InventoryValidator.validate_precio(precio_venta)
+        if not is_valid:
+            errors.append(msg)
         
         # Validar descuento si existe
         descuento = data.get('descuento', 0)
         if descuento > 0:
-            is_valid, msg = InventoryValidator.validate_descuento(
-                descuento, 
-                data.get('precio_venta', 0)
-            )
+            is_valid, msg = InventoryValidator.validate_descuento(descuento, precio_venta)
             if not is_valid:
                 errors.append(msg)
         
@@ -328,4 +364,10 @@ class InventoryValidator:
             'valid': len(errors) == 0,
             'errors': errors,
             'warnings': warnings
-        }
\ No newline at end of file
+        }
+
+
+# Atajos a nivel de módulo (evitan el lookup por la clase en bucles de validación)
+validate_imei = IMEIValidator.validate
+validate_serial = SerialNumberValidator.validate
+validate_device_input = DeviceInputValidator.validate
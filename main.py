@@ -6,6 +6,7 @@ Main server configuration and startup
 import uvicorn
 import logging
 import os
+import sys
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
@@ -13,35 +14,95 @@ from datetime import datetime
 
 # Importar los blueprints
 from app.routes import health, devices, invoice_routes, products, reniec, customers, admin, orders, historial_routes
+from app.config.settings import settings
+
+# Emojis solo si los logs van a una terminal UTF-8; fuera de un TTY (systemd, Docker)
+# el encoding puede no soportarlos y se usan marcadores ASCII
+_USE_EMOJI = sys.stderr.isatty() and (sys.stderr.encoding or '').lower().startswith('utf')
+_LOG_ENCODING = sys.stderr.encoding or 'ascii'
+_LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Equivalentes ASCII de los emojis usados en los logs de la app
+# (U+FE0F es el selector de variación de ⚠️ / ℹ️ y se descarta)
+_EMOJI_TO_ASCII = str.maketrans({
+    '✅': '[OK]',
+    '❌': '[ERROR]',
+    '⚠': '[WARN]',
+    '⛔': '[DENIED]',
+    'ℹ': '[INFO]',
+    '🚀': '[START]',
+    '📚': '[DOCS]',
+    '📋': '[ROUTES]',
+    '🛑': '[STOP]',
+    '🔄': '[RESET]',
+    '💰': '[PRICE]',
+    '📱': '[DEVICE]',
+    '🔍': '[SEARCH]',
+    '💾': '[SAVE]',
+    '🌐': '[NET]',
+    '\ufe0f': None,
+})
+
+
+class _AsciiLogFormatter(logging.Formatter):
+    """
+    Formatter para salidas sin soporte de emojis: cambia los emojis conocidos por
+    marcadores ASCII y reemplaza con '?' lo que el encoding de stderr no soporte.
+    Aplica a todos los loggers (rutas, servicios, repositorios), no solo a main.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        message = super().format(record).translate(_EMOJI_TO_ASCII)
+        return message.encode(_LOG_ENCODING, 'replace').decode(_LOG_ENCODING)
+
 
 # Configurar logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(
+    logging.Formatter(_LOG_FORMAT) if _USE_EMOJI else _AsciiLogFormatter(_LOG_FORMAT)
 )
+logging.basicConfig(level=logging.INFO, handlers=[_log_handler])
 logger = logging.getLogger(__name__)
 
 # Flag para evitar duplicación al recargar con reloader
 _routes_registered = False
 
+# Routers de la API: (router, prefijo, tag)
+_ROUTERS = (
+    (health.router, "", "health"),
+    (devices.router, "/api/devices", "devices"),
+    (invoice_routes.router, "/api/invoices", "invoices"),
+    (historial_routes.router, "/api/historial", "historial"),
+    (products.router, "/api/products", "products"),
+    (reniec.router, "/api/reniec", "reniec"),
+    (customers.router, "/api/customers", "customers"),
+    (admin.router, "/api/admin", "admin"),
+    (orders.router, "/api/orders", "orders"),
+)
+
+# Banner de arranque armado una sola vez (un único mensaje de log)
+_STARTUP_BANNER = "\n".join([
+    "=" * 60,
+    "🚀 IMEI API - FastAPI iniciando...",
+    "✅ Servidor listo para recibir peticiones",
+    "📚 Documentación interactiva: http://localhost:8000/docs",
+    "=" * 60,
+])
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
     Maneja el ciclo de vida de la aplicación
     """
-    print("\n" + "="*60)
-    print("🚀 IMEI API - FastAPI iniciando...")
-    print("="*60)
-    
-    print("\n✅ Servidor listo para recibir peticiones")
-    print("📚 Documentación interactiva: http://localhost:8000/docs")
-    print("="*60 + "\n")
+    logger.info("\n%s", _STARTUP_BANNER)
     
     yield
     
     # Shutdown
-    print("\n🛑 Servidor apagándose...")
+    logger.info("🛑 Servidor apagándose...")
+    await devices.dhru_service.aclose()
+    await reniec.reniec_service.aclose()
 
 
 def create_app() -> FastAPI:
@@ -65,13 +126,7 @@ def create_app() -> FastAPI:
     # ============ CORS CONFIGURATION ============
     app.add_middleware(
         CORSMiddleware,
-        allow_origins=[
-            "https://falcontec.vercel.app",  # Frontend producción Vercel
-            "http://localhost:5173",          # Vite dev local
-            "http://localhost:3000",          # React/Next.js local
-            "http://127.0.0.1:5173",
-            "http://127.0.0.1:3000"
-        ],
+        allow_origins=settings.cors_origins_list,  # Lista explícita (ver CORS_ORIGINS)
         allow_credentials=True,
         allow_methods=["*"],              # Permitir todos los métodos
         allow_headers=["*"],              # Permitir todos los headers
@@ -80,81 +135,16 @@ def create_app() -> FastAPI:
     # ============ REGISTRAR RUTAS ============
     global _routes_registered
     
+    for router, prefix, tag in _ROUTERS:
+        app.include_router(router, prefix=prefix, tags=[tag])
+    
+    # Solo registrar en log la primera vez (no en recargas del reloader)
     if not _routes_registered:
         _routes_registered = True
-        print("\n📋 Registrando rutas...")
-        
-        app.include_router(
-            health.router,
-            tags=["health"]
-        )
-        print("   ✓ Health routes registradas (/health)")
-        
-        app.include_router(
-            devices.router,
-            prefix="/api/devices",
-            tags=["devices"]
-        )
-        print("   ✓ Devices routes registradas (/api/devices/*)")
-        
-        app.include_router(
-            invoice_routes.router,
-            prefix="/api/invoices",
-            tags=["invoices"]
-        )
-        print("   ✓ Invoice routes registradas (/api/invoices/*)")
-
-        app.include_router(
-            historial_routes.router,
-            prefix="/api/historial",
-            tags=["historial"]
-        )
-        print("   ✓ Historial routes registradas (/api/historial)")
-        
-        app.include_router(
-            products.router,
-            prefix="/api/products",
-            tags=["products"]
-        )
-        print("   ✓ Products routes registradas (/api/products/*)")
-        
-        app.include_router(
-            reniec.router,
-            prefix="/api/reniec",
-            tags=["reniec"]
-        )
-        print("   ✓ RENIEC routes registradas (/api/reniec/*)")
-
-        app.include_router(
-            customers.router,
-            prefix="/api/customers",
-            tags=["customers"]
-        )
-        print("   ✓ Customers routes registradas (/api/customers/*)")
-
-        app.include_router(
-            admin.router,
-            prefix="/api/admin",
-            tags=["admin"]
-        )
-        print("   ✓ Admin routes registradas (/api/admin/*)")
-
-        app.include_router(
-            orders.router,
-            prefix="/api/orders",
-            tags=["orders"]
+        logger.info(
+            "📋 Rutas registradas: %s",
+            ", ".join(prefix or f"/{tag}" for _, prefix, tag in _ROUTERS)
         )
-        print("   ✓ Orders routes registradas (/api/orders/*)")
-    else:
-        # Solo registrar sin imprimir en recarga
-        app.include_router(health.router, tags=["health"])
-        app.include_router(devices.router, prefix="/api/devices", tags=["devices"])
-        app.include_router(invoice_routes.router, prefix="/api/invoices", tags=["invoices"])
-        app.include_router(products.router, prefix="/api/products", tags=["products"])
-        app.include_router(reniec.router, prefix="/api/reniec", tags=["reniec"])
-        app.include_router(customers.router, prefix="/api/customers", tags=["customers"])
-        app.include_router(admin.router, prefix="/api/admin", tags=["admin"])
-        app.include_router(orders.router, prefix="/api/orders", tags=["orders"])
     
     # ============ ROOT ENDPOINT ============
     @app.get("/", tags=["root"])